@@ -0,0 +1,163 @@
+import json
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import generate_events
+
+class BuildScheduler:
+    """Run generator builds one at a time from a single background thread.
+
+    submit() returns a job id immediately. While a job is still queued, later
+    submissions are folded into it (their changed files merged, their
+    callbacks appended) and get the same id back, so a burst of saves costs
+    one rebuild. Job status is also written under ``status_dir`` so any
+    gunicorn worker can answer a status poll; generate_events.build itself
+    holds a file lock, so builds from different workers never overlap.
+    """
+
+    KEEP_JOBS = 100
+
+    def __init__(self, events_dir, status_dir=None, on_report=None, minify=False):
+        self.events_dir = Path(events_dir)
+        # Must match how the site is built elsewhere, or pages flip between forms
+        self.minify = minify
+        # Called after every build with (report or None, seconds, error or None)
+        self.on_report = on_report
+        self.status_dir = Path(status_dir) if status_dir else self.events_dir.parent / '.build-jobs'
+        self._cond = threading.Condition()
+        self._pending = None
+        self._jobs = {}
+        self._order = []
+        self._thread = None
+
+    def submit(self, changed=None, force=False, on_done=None):
+        """Queue a build; ``changed=None`` means the full event set may have changed."""
+        with self._cond:
+            job = self._pending
+            if job is None:
+                job = {
+                    'id': uuid.uuid4().hex[:12],
+                    'state': 'queued',
+                    'submitted': time.time(),
+                    'started': None,
+                    'finished': None,
+                    'requests': 0,
+                    'report': None,
+                    'error': None,
+                    'changed': set(),
+                    'full': False,
+                    'force': False,
+                    'callbacks': [],
+                }
+                self._pending = job
+                self._remember(job)
+            job['requests'] += 1
+            if changed is None:
+                job['full'] = True
+            else:
+                job['changed'].update(Path(name).name for name in changed)
+            job['force'] = job['force'] or force
+            if on_done is not None:
+                job['callbacks'].append(on_done)
+            self._save(job)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='build-scheduler', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+            return job['id']
+
+    def status(self, job_id):
+        """Return the public view of a job, or None if it is unknown."""
+        with self._cond:
+            job = self._jobs.get(job_id)
+            if job is not None:
+                return self._public(job)
+        try:
+            with open(self.status_dir / f'{job_id}.json', 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def wait(self, job_id, timeout=None):
+        """Block until the job finishes; returns its status."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._jobs.get(job_id, {}).get('state') in ('queued', 'running'):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+        return self.status(job_id)
+
+    def _remember(self, job):
+        self._jobs[job['id']] = job
+        self._order.append(job['id'])
+        while len(self._order) > self.KEEP_JOBS:
+            old_id = self._order.pop(0)
+            self._jobs.pop(old_id, None)
+            try:
+                (self.status_dir / f'{old_id}.json').unlink()
+            except OSError:
+                pass
+
+    def _public(self, job):
+        return {
+            'id': job['id'],
+            'state': job['state'],
+            'submitted': job['submitted'],
+            'started': job['started'],
+            'finished': job['finished'],
+            'requests': job['requests'],
+            'report': job['report'],
+            'error': job['error'],
+        }
+
+    def _save(self, job):
+        try:
+            self.status_dir.mkdir(exist_ok=True)
+            generate_events.write_if_changed(self.status_dir / f"{job['id']}.json", json.dumps(self._public(job)))
+        except OSError as e:
+            print(f"Could not record build status: {e}")
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                job, self._pending = self._pending, None
+                job['state'] = 'running'
+                job['started'] = time.time()
+                self._save(job)
+
+            report = None
+            started = time.perf_counter()
+            try:
+                changed = None if job['full'] else sorted(job['changed'])
+                report = generate_events.build(self.events_dir, changed=changed, force=job['force'],
+                                               minify=self.minify)
+                state, error = 'done', None
+            except Exception as e:
+                print(f"Generator failed: {str(e)}")
+                state, error = 'failed', str(e)
+            if self.on_report is not None:
+                try:
+                    self.on_report(report, time.perf_counter() - started, error)
+                except Exception as e:
+                    print(f"Build report hook failed: {str(e)}")
+
+            for callback in job['callbacks']:
+                try:
+                    callback(report)
+                except Exception as e:
+                    print(f"Build callback failed: {str(e)}")
+
+            with self._cond:
+                job['state'] = state
+                job['error'] = error
+                job['report'] = report.to_dict() if report is not None else None
+                job['finished'] = time.time()
+                job['callbacks'] = []
+                self._save(job)
+                self._cond.notify_all()
@@ -0,0 +1,200 @@
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+class PublishWorker:
+    """Commit and push admin edits from a background thread.
+
+    Saves and deletes call submit() with the paths they touched and return
+    immediately. Submissions arriving within ``debounce`` seconds of each other
+    are coalesced into one commit and one push; ``max_delay`` caps how long a
+    steady stream of edits can hold a batch back.
+    """
+
+    def __init__(self, repo_dir, debounce=5.0, max_delay=60.0, ssh_command='ssh -i ~/.ssh/id_ed25519',
+                 on_publish=None):
+        self.repo_dir = Path(repo_dir)
+        # Called after every batch with (success, seconds)
+        self.on_publish = on_publish
+        self.debounce = debounce
+        self.max_delay = max_delay
+        self.ssh_command = ssh_command
+        self._cond = threading.Condition()
+        self._paths = set()
+        self._messages = []
+        self._first_submit = None
+        self._last_submit = None
+        self._thread = None
+        self._repo = None
+        # A commit was made but its push failed; retried with the next batch
+        self._unpushed = False
+        self._status = {
+            'publishing': False,
+            'batches': 0,
+            'last_commit': None,
+            'last_push': None,
+            'last_result': None,
+            'last_error': None,
+        }
+
+    def submit(self, paths, message):
+        """Queue paths (absolute or repo-relative) to be committed with message."""
+        with self._cond:
+            for path in paths:
+                path = Path(path)
+                if path.is_absolute():
+                    try:
+                        path = path.relative_to(self.repo_dir)
+                    except ValueError:
+                        continue
+                self._paths.add(path.as_posix())
+            self._messages.append(message)
+            now = time.monotonic()
+            if self._first_submit is None:
+                self._first_submit = now
+            self._last_submit = now
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name='publish-worker', daemon=True)
+                self._thread.start()
+            self._cond.notify()
+
+    def status(self):
+        with self._cond:
+            status = dict(self._status)
+            status['queued_paths'] = len(self._paths)
+            status['queued_messages'] = len(self._messages)
+            return status
+
+    def flush(self, timeout=None):
+        """Publish whatever is queued now, skipping the debounce window."""
+        with self._cond:
+            if self._first_submit is not None:
+                self._first_submit -= self.max_delay
+            self._cond.notify()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._messages or self._status['publishing']:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def _take_batch(self):
+        """Block until a batch is due, then return (paths, messages)."""
+        with self._cond:
+            while True:
+                if not self._messages and not self._unpushed:
+                    self._cond.wait()
+                    continue
+                now = time.monotonic()
+                due = min(self._last_submit + self.debounce, self._first_submit + self.max_delay)
+                if now >= due:
+                    break
+                self._cond.wait(due - now)
+            paths, messages = sorted(self._paths), self._messages
+            self._paths, self._messages = set(), []
+            self._first_submit = self._last_submit = None
+            self._status['publishing'] = True
+            return paths, messages
+
+    def _run(self):
+        while True:
+            paths, messages = self._take_batch()
+            committed = self._status['last_commit']
+            started = time.perf_counter()
+            try:
+                success, result = self.publish(paths, messages)
+            except Exception as e:
+                success, result = False, f"Error committing changes: {str(e)}"
+            print(f"Publish: {result}")
+            if not success:
+                # Once committed, the messages are recorded; only the push is retried
+                self._requeue(paths, messages if self._status['last_commit'] == committed else [])
+            if self.on_publish is not None:
+                self.on_publish(success, time.perf_counter() - started)
+            with self._cond:
+                self._status['publishing'] = False
+                self._status['batches'] += 1
+                self._status['last_result'] = result
+                self._status['last_error'] = None if success else result
+                self._cond.notify_all()
+
+    def _requeue(self, paths, messages):
+        """Put a failed batch back so it is retried instead of lost.
+
+        The retry waits ``max_delay`` so a persistent failure doesn't spin,
+        but new submissions still publish it after the usual debounce.
+        """
+        with self._cond:
+            self._paths.update(paths)
+            self._messages = messages + self._messages
+            now = time.monotonic()
+            if self._first_submit is None:
+                self._first_submit = now
+            self._last_submit = max(self._last_submit or now, now + self.max_delay - self.debounce)
+
+    def _publishable(self, repo, paths):
+        """Drop paths git can't stage: neither on disk nor tracked.
+
+        ``git add`` rejects the whole call if any pathspec matches nothing,
+        e.g. a page that was never generated or an output nobody committed.
+        """
+        missing = [path for path in paths if not (self.repo_dir / path).exists()]
+        if not missing:
+            return paths
+        tracked = set(repo.git.ls_files('-z', '--', *missing).split('\0'))
+        return [path for path in paths if path not in missing or path in tracked]
+
+    def _get_repo(self):
+        import git
+        if self._repo is None:
+            self._repo = git.Repo(self.repo_dir)
+        return self._repo
+
+    def publish(self, paths, messages):
+        """Stage exactly ``paths``, make one commit and push it once."""
+        # GitPython is slow to import, so the first publish loads it rather
+        # than admin server startup
+        import git
+        if not paths and not self._unpushed:
+            return True, "No changes to commit"
+        if len(messages) == 1:
+            message = messages[0]
+        else:
+            message = f"Update {len(messages)} events\n\n" + '\n'.join(f"- {m}" for m in messages)
+        try:
+            repo = self._get_repo()
+            with repo.git.custom_environment(GIT_SSH_COMMAND=self.ssh_command):
+                paths = self._publishable(repo, paths)
+                if paths:
+                    # add -A on explicit paths stages edits and deletions of just those files
+                    repo.git.add('-A', '--', *paths)
+                if repo.is_dirty(index=True, working_tree=False, untracked_files=False):
+                    commit = repo.index.commit(message)
+                    print(f"Created commit: {commit.hexsha}")
+                    with self._cond:
+                        self._status['last_commit'] = commit.hexsha
+                        self._unpushed = True
+                elif not self._unpushed:
+                    return True, "No changes to commit"
+
+                current_branch = repo.active_branch.name
+
+                try:
+                    origin = repo.remote(name='origin')
+                    push_info = origin.push(current_branch)
+                except (git.exc.GitCommandError, ValueError) as e:
+                    return False, f"Error pushing changes: {str(e)}"
+                for info in push_info:
+                    if info.flags & git.PushInfo.ERROR:
+                        return False, f"Error pushing to {current_branch}: {info.summary}"
+                with self._cond:
+                    self._status['last_push'] = datetime.now(timezone.utc).isoformat()
+                    self._unpushed = False
+                return True, f"Changes committed and pushed to {current_branch}"
+        except git.exc.InvalidGitRepositoryError:
+            return False, "Not a valid Git repository"
+        except git.exc.NoSuchPathError:
+            return False, "Repository path does not exist"
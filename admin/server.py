@@ -1,17 +1,24 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, g, request, jsonify, send_from_directory
 from flask_cors import CORS
+import hashlib
 import json
+import mimetypes
 import os
-import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta
 from pathlib import Path
 from dotenv import load_dotenv
-from datetime import datetime
-import git
+from werkzeug.security import safe_join
+from metrics import Registry
+from publisher import PublishWorker
 
 # Load environment variables
 load_dotenv()
 
-app = Flask(__name__, static_folder='..', static_url_path='')
+# Site files go through serve_static (precompressed variants, cache headers)
+# rather than Flask's built-in static route
+app = Flask(__name__, static_folder=None)
 
 # Configure CORS for local development
 CORS(app, resources={
@@ -19,62 +26,156 @@ CORS(app, resources={
         "origins": ["http://127.0.0.1:5001", "http://localhost:5001", "http://127.0.0.1:8080", "http://localhost:8080"],
         "supports_credentials": True,
         "methods": ["GET", "POST", "DELETE", "OPTIONS"],
-        "allow_headers": ["Content-Type"]
+        "allow_headers": ["Content-Type"],
+        "expose_headers": ["X-Next-Cursor", "X-Total-Count"]
     }
 })
 
 # Set the base directory for the application (local development)
 BASE_DIR = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-EVENTS_DIR = BASE_DIR / 'events'
+# ADMIN_SITE_DIR points the editor at another checkout of the site (e.g. a benchmark corpus)
+SITE_DIR = Path(os.environ.get('ADMIN_SITE_DIR') or BASE_DIR)
+EVENTS_DIR = SITE_DIR / 'events'
 
-def commit_and_push_changes(message):
-    """Commit and push changes to GitHub using SSH."""
+# The generator lives at the repository root; import it so builds run
+# in-process and reuse its template/event caches between requests.
+sys.path.insert(0, str(BASE_DIR))
+import generate_events
+from build_queue import BuildScheduler
+
+# Prometheus metrics served at /metrics (per worker process)
+metrics = Registry()
+request_duration = metrics.histogram(
+    'admin_request_duration_seconds', 'Time spent handling admin requests', ('route', 'method', 'status'))
+build_duration = metrics.histogram(
+    'admin_build_duration_seconds', 'Wall-clock time of generator builds', ('result',))
+build_stage_duration = metrics.histogram(
+    'admin_build_stage_seconds', 'Time spent in each generator build stage', ('stage',))
+build_pages = metrics.counter(
+    'admin_build_pages_total', 'Event pages considered by builds', ('result',))
+build_bytes_written = metrics.counter(
+    'admin_build_bytes_written_total', 'Bytes written by builds')
+build_bytes_minified = metrics.counter(
+    'admin_build_minify_bytes_saved_total', 'Bytes removed from build output by minification')
+publish_duration = metrics.histogram(
+    'admin_publish_duration_seconds', 'Time to commit and push one batch', ('result',))
+
+def record_build(report, seconds, error):
+    build_duration.observe(seconds, result='failed' if error else 'done')
+    if report is None:
+        return
+    for stage, stage_seconds in report.timings.items():
+        build_stage_duration.observe(stage_seconds, stage=stage)
+    build_pages.inc(report.counters.get('pages_rendered', 0), result='rendered')
+    build_pages.inc(report.counters.get('pages_skipped', 0), result='skipped')
+    build_bytes_written.inc(report.counters.get('bytes_written', 0))
+    build_bytes_minified.inc(report.counters.get('minify_bytes_saved', 0))
+
+def record_publish(success, seconds):
+    publish_duration.observe(seconds, result='pushed' if success else 'failed')
+
+# Commits and pushes run in the background, batching edits made within the
+# debounce window into a single commit. GitPython is loaded by the first push.
+publisher = PublishWorker(SITE_DIR, debounce=float(os.environ.get('PUBLISH_DEBOUNCE', '5')),
+                          on_publish=record_publish)
+
+# Builds run one at a time off the request thread; queued rebuilds collapse
+# MINIFY_OUTPUT=1 matches sites built with generate_events.py --minify
+build_scheduler = BuildScheduler(EVENTS_DIR, on_report=record_build,
+                                 minify=os.environ.get('MINIFY_OUTPUT', '') not in ('', '0'))
+
+# Parsed, sorted events shared by every request in this process. The events
+# directory is first read (and watched) by the first request, not at import.
+event_index = generate_events.EventIndex(EVENTS_DIR)
+_events_body = {'version': None, 'body': None}
+
+@app.before_request
+def start_timer():
+    g.request_started = time.perf_counter()
+
+@app.after_request
+def observe_request(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        request_duration.observe(time.perf_counter() - started,
+                                 route=route, method=request.method, status=response.status_code)
+    return response
+
+def job_response(job_id, message, extra=None):
+    """Reply 202 with the build job id, or wait for it when called with ?wait=1."""
+    extra = extra or {}
+    if not request.args.get('wait'):
+        return jsonify(dict({'success': True, 'message': message, 'job': job_id}, **extra)), 202
+    status = build_scheduler.wait(job_id, timeout=300)
+    if status is None or status['state'] != 'done':
+        return jsonify(dict({
+            'error': 'Failed to generate pages',
+            'details': status['error'] if status else 'Unknown build job',
+            'job': job_id
+        }, **extra)), 500
+    return jsonify(dict({'success': True, 'message': message, 'job': job_id, 'report': status['report']}, **extra))
+
+def event_filename_error(filename):
+    """Return why filename can't name an event JSON file, or None."""
+    if not isinstance(filename, str) or not filename.endswith('.json') or Path(filename).name != filename:
+        return 'Invalid filename format'
+    if filename in generate_events.GENERATED_JSON:
+        return 'Invalid filename format'
+    return None
+
+def event_data_error(event_data):
+    """Return why event_data can't be saved, or None."""
+    if not isinstance(event_data, dict):
+        return 'Event data must be an object'
+    for field in ('date', 'artists', 'venue'):
+        if field not in event_data:
+            return f'Missing required field: {field}'
     try:
-        # Initialize git repository
-        repo = git.Repo(BASE_DIR)
-        
-        # Configure Git to use SSH
-        with repo.git.custom_environment(GIT_SSH_COMMAND='ssh -i ~/.ssh/id_ed25519'):
-            # Check if we have changes
-            if not repo.is_dirty():
-                return True, "No changes to commit"
-            
-            # Get the current branch
-            current_branch = repo.active_branch.name
-            
-            # Add all changes
-            repo.index.add(['events/*', '*.html'])
-            
-            # Create commit
-            try:
-                commit = repo.index.commit(message)
-                print(f"Created commit: {commit.hexsha}")
-            except git.exc.GitCommandError as e:
-                if "nothing to commit" in str(e):
-                    return True, "No changes to commit"
-                raise
-            
-            # Push changes
-            try:
-                origin = repo.remote(name='origin')
-                push_info = origin.push(current_branch)
-                print(f"Push info: {push_info}")
-                
-                # Check if push was successful
-                for info in push_info:
-                    if info.flags & git.PushInfo.ERROR:
-                        return False, f"Error pushing to {current_branch}: {info.summary}"
-                
-                return True, f"Changes committed and pushed to {current_branch}"
-            except git.exc.GitCommandError as e:
-                return False, f"Error pushing changes: {str(e)}"
-                
-    except git.exc.InvalidGitRepositoryError:
-        return False, "Not a valid Git repository"
-    except git.exc.NoSuchPathError:
-        return False, "Repository path does not exist"
-    except Exception as e:
-        return False, f"Error committing changes: {str(e)}"
+        generate_events.parse_date(event_data['date'])
+    except (TypeError, ValueError):
+        return f"Unrecognized date: {event_data['date']}"
+    # The generator reads these shapes directly; a file it can't render
+    # would fail every build until fixed by hand
+    artists = event_data['artists']
+    if not isinstance(artists, list) or not all(
+            isinstance(artist, dict) and isinstance(artist.get('name'), str) for artist in artists):
+        return "'artists' must be a list of objects with a 'name'"
+    venue = event_data['venue']
+    if not isinstance(venue, dict) or not isinstance(venue.get('name'), str):
+        return "'venue' must be an object with a 'name'"
+    return None
+
+# Fingerprinted URLs (?v=<hash>) and hash-named image derivatives never change
+IMMUTABLE_CACHE = 'public, max-age=31536000, immutable'
+
+def send_site_file(directory, filename):
+    """Send a site file, preferring a .br/.gz sibling the client accepts.
+
+    The generator keeps those siblings current. Fingerprinted resources are
+    cacheable forever; everything else must be revalidated (ETag /
+    Last-Modified, answered with 304 by send_file).
+    """
+    path = safe_join(str(directory), filename)
+    if path is None or not os.path.isfile(path):
+        return jsonify({'error': 'Not found'}), 404
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    encoding = None
+    if os.path.splitext(filename)[1] in generate_events.COMPRESSIBLE_SUFFIXES:
+        for ext, name in (('.br', 'br'), ('.gz', 'gzip')):
+            if request.accept_encodings[name] and os.path.isfile(path + ext):
+                encoding = name
+                filename += ext
+                break
+    response = send_from_directory(directory, filename, mimetype=mimetype)
+    if encoding is not None:
+        response.content_encoding = encoding
+    response.vary.add('Accept-Encoding')
+    if request.args.get('v') or filename.startswith(generate_events.DERIVED_IMAGE_DIR + '/'):
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE
+    else:
+        response.cache_control.no_cache = True
+    return response
 
 @app.route('/')
 def serve_editor():
@@ -86,45 +187,136 @@ def serve_editor_html():
 
 @app.route('/style.css')
 def serve_style():
-    return send_from_directory(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'style.css')
+    return send_site_file(SITE_DIR, 'style.css')
 
 @app.route('/admin/admin.css')
 def serve_admin_style():
-    return send_from_directory(os.path.dirname(os.path.abspath(__file__)), 'admin.css')
+    return send_site_file(os.path.dirname(os.path.abspath(__file__)), 'admin.css')
 
 @app.route('/<path:path>')
 def serve_static(path):
     if path == 'editor.html':
         return send_from_directory(os.path.dirname(os.path.abspath(__file__)), path)
-    return send_from_directory(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), path)
+    return send_site_file(SITE_DIR, path)
+
+# Query parameters understood by GET /events
+LIST_PARAMS = ('from', 'to', 'status', 'fields', 'limit', 'cursor')
+MAX_PAGE_SIZE = 500
+
+def _parse_day(value, name):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').strftime('%Y-%m-%d')
+    except ValueError:
+        raise ValueError(f"Invalid '{name}' date, expected YYYY-MM-DD: {value}")
+
+def _project(item, fields):
+    """Keep only the requested fields; ``artists.name`` selects inside lists and objects."""
+    groups = {}
+    for field in fields:
+        head, _, rest = field.partition('.')
+        groups.setdefault(head, []).append(rest)
+    projected = {}
+    for head, rests in groups.items():
+        if head not in item:
+            continue
+        value = item[head]
+        if '' not in rests:
+            if isinstance(value, dict):
+                value = _project(value, rests)
+            elif isinstance(value, list):
+                value = [_project(v, rests) if isinstance(v, dict) else v for v in value]
+        projected[head] = value
+    return projected
+
+def list_events_query(args):
+    """GET /events with from/to/status/fields/limit/cursor parameters.
+
+    The date window is located by bisecting the sorted index, and only the
+    returned page is projected and serialized. The next page's cursor is sent
+    in X-Next-Cursor and the number of events in the window in X-Total-Count.
+    """
+    start = _parse_day(args['from'], 'from') if args.get('from') else None
+    end = _parse_day(args['to'], 'to') if args.get('to') else None
+    status = args.get('status')
+    today = date.today()
+    if status == 'upcoming':
+        start = max(filter(None, [start, today.isoformat()]))
+    elif status == 'past':
+        end = min(filter(None, [end, (today - timedelta(days=1)).isoformat()]))
+    elif status:
+        raise ValueError("'status' must be 'upcoming' or 'past'")
+    limit = None
+    if args.get('limit'):
+        if not args['limit'].isdigit() or not 1 <= int(args['limit']) <= MAX_PAGE_SIZE:
+            raise ValueError(f"'limit' must be between 1 and {MAX_PAGE_SIZE}")
+        limit = int(args['limit'])
+    fields = [f for f in args.get('fields', '').split(',') if f]
+
+    # The ETag covers the index state and the query (and the day, which
+    # moves the upcoming/past boundary), so revalidation needs no filtering
+    version, index_etag, last_modified, _events = event_index.snapshot()
+    query = '&'.join(f'{name}={args.get(name, "")}' for name in LIST_PARAMS)
+    if status:
+        query += f'&today={today.isoformat()}'
+    etag = f'{index_etag}-{hashlib.sha1(query.encode()).hexdigest()[:12]}'
+    if etag in request.if_none_match:
+        response = Response(status=304)
+    else:
+        _version, _etag, events, next_cursor, total = event_index.select(start, end, args.get('cursor'), limit)
+        if fields:
+            events = [_project(event, fields) for event in events]
+        response = Response(app.json.dumps(events), mimetype='application/json')
+        response.headers['X-Total-Count'] = str(total)
+        if next_cursor is not None:
+            response.headers['X-Next-Cursor'] = next_cursor
+    response.set_etag(etag)
+    response.last_modified = last_modified
+    response.cache_control.no_cache = True
+    return response
 
 @app.route('/events', methods=['GET'])
 def list_events():
     try:
-        events = []
-        for event_file in EVENTS_DIR.glob('*.json'):
-            with open(event_file, 'r') as f:
-                event_data = json.load(f)
-                # Add filename to the event data
-                event_data['filename'] = event_file.name
-                # Add formatted date for sorting
-                try:
-                    date_obj = datetime.strptime(event_data['date'], '%A %B %d, %Y')
-                    event_data['sort_date'] = date_obj.strftime('%Y-%m-%d')
-                except:
-                    event_data['sort_date'] = '0000-00-00'  # Invalid dates sort last
-                events.append(event_data)
-        
-        # Sort events by date
-        events.sort(key=lambda x: x['sort_date'])
-        return jsonify(events)
+        if any(name in request.args for name in LIST_PARAMS):
+            try:
+                return list_events_query(request.args)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        version, etag, last_modified, events = event_index.snapshot()
+        # Serialize once per index version rather than once per request
+        if _events_body['version'] != version:
+            _events_body['body'] = app.json.dumps(events)
+            _events_body['version'] = version
+        response = Response(_events_body['body'], mimetype='application/json')
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@app.route('/search', methods=['GET'])
+def search_events():
+    """Events whose artists or venue match every word of ?q= (prefix match), newest first."""
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': "Missing 'q' parameter"}), 400
+    limit = request.args.get('limit', '20')
+    if not limit.isdigit() or not 1 <= int(limit) <= MAX_PAGE_SIZE:
+        return jsonify({'error': f"'limit' must be between 1 and {MAX_PAGE_SIZE}"}), 400
+    try:
+        etag, results = event_index.search(query, int(limit))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    response = jsonify({'query': query, 'results': results})
+    response.set_etag(hashlib.sha1(f'{etag}:{limit}:{query}'.encode()).hexdigest())
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
 @app.route('/events/<filename>', methods=['DELETE'])
 def delete_event(filename):
     try:
-        if not filename.endswith('.json'):
+        if not filename.endswith('.json') or filename in generate_events.GENERATED_JSON:
             return jsonify({'error': 'Invalid filename format'}), 400
         
         event_path = EVENTS_DIR / filename
@@ -133,22 +325,24 @@ def delete_event(filename):
         
         # Delete the JSON file
         event_path.unlink()
+        event_index.invalidate(filename)
         
         # Delete the corresponding HTML file if it exists
+        touched = [event_path]
         html_path = EVENTS_DIR / filename.replace('.json', '.html')
         if html_path.exists():
             html_path.unlink()
+            touched.append(html_path)
         
-        # Regenerate the main page
-        subprocess.run(['python3', 'generate_events.py'], 
-                      capture_output=True, text=True, cwd=str(BASE_DIR))
+        # Regenerate the main page, then commit and push in the background
+        def publish_delete(report):
+            if report is not None:
+                touched.extend(report.generated)
+            publisher.submit(touched, f"Delete event: {filename}")
         
-        # Commit and push changes
-        success, message = commit_and_push_changes(f"Delete event: {filename}")
-        if not success:
-            return jsonify({'warning': message}), 200  # Still return 200 since the delete was successful
+        job_id = build_scheduler.submit(changed=[filename], on_done=publish_delete)
         
-        return jsonify({'success': True, 'message': message})
+        return job_response(job_id, 'Changes queued for publishing')
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
@@ -161,7 +355,7 @@ def get_event(filename):
         
         # For HTML files, serve them directly
         if filename.endswith('.html'):
-            return send_from_directory(EVENTS_DIR, filename)
+            return send_site_file(EVENTS_DIR, filename)
         
         # For JSON files, return the data
         event_path = EVENTS_DIR / filename
@@ -182,95 +376,140 @@ def save_event():
         filename = data['filename']
         event_data = data['data']
         
-        # Validate the event data
-        required_fields = ['date', 'artists', 'venue']
-        for field in required_fields:
-            if field not in event_data:
-                return jsonify({'error': f'Missing required field: {field}'}), 400
-        
-        # Validate filename format (YYYY-MM-DD.json)
-        if not filename.endswith('.json'):
-            return jsonify({'error': 'Invalid filename format'}), 400
+        # Validate the event data and filename format (YYYY-MM-DD.json)
+        error = event_data_error(event_data) or event_filename_error(filename)
+        if error:
+            return jsonify({'error': error}), 400
         
         # Save the event data
         EVENTS_DIR.mkdir(exist_ok=True)
         
-        with open(EVENTS_DIR / filename, 'w') as f:
-            json.dump(event_data, f, indent=4)
+        generate_events.write_if_changed(EVENTS_DIR / filename, json.dumps(event_data, indent=4))
+        event_index.invalidate(filename)
         
-        # Generate pages using the script from the correct directory
-        try:
-            result = subprocess.run(
-                ['python3', 'generate_events.py'],
-                cwd=str(BASE_DIR),
-                capture_output=True,
-                text=True,
-                check=True  # This will raise CalledProcessError if the script fails
-            )
-            print(f"Generator script output: {result.stdout}")
-            if result.stderr:
-                print(f"Generator script warnings: {result.stderr}")
-        except subprocess.CalledProcessError as e:
-            print(f"Generator script failed: {e.stderr}")
-            return jsonify({
-                'error': 'Failed to generate pages',
-                'details': e.stderr
-            }), 500
-        except Exception as e:
-            print(f"Error running generator script: {str(e)}")
-            return jsonify({
-                'error': 'Error running generator script',
-                'details': str(e)
-            }), 500
+        # Regenerate pages in the background, re-reading only the file we just
+        # wrote; once built, publish exactly what this save touched
+        def publish_save(report):
+            if report is not None:
+                publisher.submit([EVENTS_DIR / filename] + report.generated, f"Update event: {filename}")
         
-        # Commit and push changes
-        success, message = commit_and_push_changes(f"Update event: {filename}")
-        if not success:
-            return jsonify({'warning': message}), 200  # Still return 200 since the save was successful
+        job_id = build_scheduler.submit(changed=[filename], on_done=publish_save)
         
-        return jsonify({
-            'success': True,
-            'message': message,
-            'generated': True
-        })
+        return job_response(job_id, 'Changes queued for publishing')
     except Exception as e:
         print(f"Error in save_event: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+MAX_BULK_ITEMS = 500
+
+@app.route('/events/bulk', methods=['POST'])
+def bulk_events():
+    """Apply many upserts and deletes with one build and one commit.
+
+    Body: {"upserts": [{"filename": ..., "data": {...}}, ...], "deletes": [filename, ...]}.
+    Every item is validated before anything is written; if any item is
+    invalid nothing is applied and the per-item errors are returned.
+    """
+    try:
+        data = request.get_json(silent=True) or {}
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Request body must be a JSON object'}), 400
+        upserts = data.get('upserts') or []
+        deletes = data.get('deletes') or []
+        if not isinstance(upserts, list) or not isinstance(deletes, list):
+            return jsonify({'error': "'upserts' and 'deletes' must be lists"}), 400
+        if not upserts and not deletes:
+            return jsonify({'error': 'Nothing to apply'}), 400
+        if len(upserts) + len(deletes) > MAX_BULK_ITEMS:
+            return jsonify({'error': f'At most {MAX_BULK_ITEMS} items per request'}), 400
+
+        results = []
+        seen = set()
+        for item in upserts:
+            filename = item.get('filename') if isinstance(item, dict) else None
+            error = event_filename_error(filename) or event_data_error(item['data'] if 'data' in item else None)
+            if error is None and filename in seen:
+                error = 'Filename appears more than once'
+            if error is None:
+                seen.add(filename)
+            results.append({'filename': filename, 'action': 'upsert', 'error': error})
+        for filename in deletes:
+            error = event_filename_error(filename)
+            if error is None and filename in seen:
+                error = 'Filename appears more than once'
+            elif error is None and not (EVENTS_DIR / filename).exists():
+                error = 'Event not found'
+            if error is None:
+                seen.add(filename)
+            results.append({'filename': filename, 'action': 'delete', 'error': error})
+        if any(result['error'] for result in results):
+            return jsonify({'error': 'Validation failed; nothing was applied', 'results': results}), 400
+
+        EVENTS_DIR.mkdir(exist_ok=True)
+        touched = []
+        for item, result in zip(upserts, results):
+            event_path = EVENTS_DIR / item['filename']
+            existed = event_path.exists()
+            written = generate_events.write_if_changed(event_path, json.dumps(item['data'], indent=4))
+            result['status'] = ('updated' if existed else 'created') if written else 'unchanged'
+            touched.append(event_path)
+        for filename, result in zip(deletes, results[len(upserts):]):
+            event_path = EVENTS_DIR / filename
+            html_path = EVENTS_DIR / filename.replace('.json', '.html')
+            event_path.unlink()
+            touched.append(event_path)
+            if html_path.exists():
+                html_path.unlink()
+                touched.append(html_path)
+            result['status'] = 'deleted'
+        for result in results:
+            del result['error']
+        event_index.invalidate()
+
+        saved = sum(1 for result in results if result['status'] in ('created', 'updated'))
+        deleted = len(deletes)
+        message = f"Bulk update: {saved} saved, {deleted} deleted"
+
+        # One incremental build for the whole batch, then one commit
+        def publish_bulk(report):
+            if report is not None:
+                publisher.submit(touched + report.generated, message)
+
+        changed = [result['filename'] for result in results if result['status'] != 'unchanged']
+        job_id = build_scheduler.submit(changed=changed, on_done=publish_bulk)
+        return job_response(job_id, message, {'results': results})
+    except Exception as e:
+        print(f"Error in bulk_events: {str(e)}")
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/generate', methods=['POST'])
 def generate_pages():
     try:
-        # Run the generator script from the correct directory
-        result = subprocess.run(
-            ['python3', 'generate_events.py'],
-            cwd=str(BASE_DIR),
-            capture_output=True,
-            text=True,
-            check=True  # This will raise CalledProcessError if the script fails
-        )
-        
-        print(f"Generator script output: {result.stdout}")
-        if result.stderr:
-            print(f"Generator script warnings: {result.stderr}")
+        job_id = build_scheduler.submit()
         
-        return jsonify({
-            'success': True,
-            'message': 'Pages generated successfully',
-            'output': result.stdout
-        })
-    except subprocess.CalledProcessError as e:
-        print(f"Generator script failed: {e.stderr}")
-        return jsonify({
-            'error': 'Failed to generate pages',
-            'details': e.stderr
-        }), 500
+        return job_response(job_id, 'Page generation queued')
     except Exception as e:
-        print(f"Error running generator script: {str(e)}")
+        print(f"Generator failed: {str(e)}")
         return jsonify({
-            'error': 'Error running generator script',
+            'error': 'Failed to generate pages',
             'details': str(e)
         }), 500
 
+@app.route('/generate/status/<job_id>', methods=['GET'])
+def generate_status(job_id):
+    status = build_scheduler.status(job_id)
+    if status is None:
+        return jsonify({'error': 'Unknown build job'}), 404
+    return jsonify(status)
+
+@app.route('/metrics', methods=['GET'])
+def serve_metrics():
+    return Response(metrics.render(), content_type=metrics.content_type)
+
+@app.route('/publish/status', methods=['GET'])
+def publish_status():
+    return jsonify(publisher.status())
+
 if __name__ == '__main__':
     # In development, run without SSL
     app.run(port=5001, debug=True) 
\ No newline at end of file
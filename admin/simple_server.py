@@ -1,9 +1,9 @@
 #!/usr/bin/env python3
 
-from flask import Flask, jsonify
+from flask import Flask, Response, jsonify, request
 from flask_cors import CORS
-import json
 import os
+import sys
 from pathlib import Path
 
 app = Flask(__name__)
@@ -13,6 +13,11 @@ CORS(app)
 BASE_DIR = Path(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 EVENTS_DIR = BASE_DIR / 'events'
 
+sys.path.insert(0, str(BASE_DIR))
+import generate_events
+
+event_index = generate_events.EventIndex(EVENTS_DIR)
+
 @app.route('/test')
 def test():
     return jsonify({'message': 'Server is running!'})
@@ -20,17 +25,11 @@ def test():
 @app.route('/events', methods=['GET'])
 def list_events():
     try:
-        events = []
-        if EVENTS_DIR.exists():
-            for event_file in EVENTS_DIR.glob('*.json'):
-                try:
-                    with open(event_file, 'r') as f:
-                        event_data = json.load(f)
-                        event_data['filename'] = event_file.name
-                        events.append(event_data)
-                except Exception as e:
-                    print(f"Error reading {event_file}: {e}")
-        return jsonify(events)
+        _version, etag, last_modified, events = event_index.snapshot()
+        response = Response(app.json.dumps(events), mimetype='application/json')
+        response.set_etag(etag)
+        response.last_modified = last_modified
+        return response.make_conditional(request)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
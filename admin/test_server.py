@@ -1,18 +1,31 @@
 #!/usr/bin/env python3
+import sys
+import time
 
+# Importing the server pulls in Flask, Flask-CORS and python-dotenv; GitPython
+# is only needed once something is published, so it must not load here.
+started = time.perf_counter()
 try:
-    import flask
-    print("Flask imported successfully")
-except ImportError as e:
-    print(f"Flask import error: {e}")
+    import server
+    print(f"Server module imported successfully ({time.perf_counter() - started:.3f}s)")
+except Exception as e:
+    print(f"Server import error: {e}")
+    exit(1)
+
+if 'git' in sys.modules:
+    print("GitPython was imported at startup; it should load on first publish")
     exit(1)
 
+started = time.perf_counter()
 try:
-    import flask_cors
-    print("Flask-CORS imported successfully")
-except ImportError as e:
-    print(f"Flask-CORS import error: {e}")
+    response = server.app.test_client().get('/events')
+except Exception as e:
+    print(f"First request error: {e}")
     exit(1)
+if response.status_code != 200:
+    print(f"First request failed: {response.status_code}")
+    exit(1)
+print(f"First request served ({time.perf_counter() - started:.3f}s)")
 
 try:
     import git
@@ -21,21 +34,4 @@ except ImportError as e:
     print(f"GitPython import error: {e}")
     exit(1)
 
-try:
-    from dotenv import load_dotenv
-    print("python-dotenv imported successfully")
-except ImportError as e:
-    print(f"python-dotenv import error: {e}")
-    exit(1)
-
-print("All imports successful!")
-
-# Try to import the server
-try:
-    import server
-    print("Server module imported successfully")
-except Exception as e:
-    print(f"Server import error: {e}")
-    exit(1)
-
-print("Test completed successfully!") 
\ No newline at end of file
+print("Test completed successfully!")
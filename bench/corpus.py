@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Generate a synthetic site with N events for benchmarking.
+
+    python3 bench/corpus.py 1000 /tmp/corpus-1k
+
+The output directory gets events/*.json (one event per day, ending a few
+weeks after --anchor so both upcoming and past events exist), plus copies
+of the real event templates and index.html.
+"""
+import argparse
+import json
+import random
+import shutil
+from datetime import date, timedelta
+from pathlib import Path
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+SYLLABLES = ['ka', 'mi', 'ro', 'lu', 'ne', 'sha', 'vo', 'pin', 'k', 'el', 'dra', 'mo', 'ta', 'zu', 'bel', 'ax']
+WORDS = ['ambient', 'noise', 'pop', 'synth', 'cello', 'modular', 'tape', 'drone', 'club', 'folk',
+         'improvised', 'electronic', 'hardware', 'vocal', 'loops', 'feedback', 'field', 'recordings',
+         'based', 'in', 'the', 'with', 'and', 'from', 'live', 'set', 'visual', 'experimental']
+VENUES = ['Union Pool', 'P.I.T.', 'Cassette', 'Nightclub101', 'Trans-Pecos', 'Wonderville',
+          'Public Records', 'Elsewhere', 'Baby\'s All Right', 'The Glove', 'Mood Ring', 'Sultan Room']
+HOODS = ['Brooklyn', 'Queens', 'Manhattan', 'Ridgewood']
+
+def _name(rng):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize()
+
+def _sentence(rng, low, high):
+    return ' '.join(rng.choice(WORDS) for _ in range(rng.randint(low, high))).capitalize()
+
+def make_event(rng, day):
+    artists = []
+    for _ in range(rng.randint(2, 5)):
+        name = f'{_name(rng)} {_name(rng)}' if rng.random() < 0.4 else _name(rng)
+        artists.append({
+            'name': name,
+            'link': f'https://{name.lower().replace(" ", "")}.bandcamp.com/',
+            'description': _sentence(rng, 12, 45),
+        })
+    venue = rng.choice(VENUES)
+    event = {
+        'date': f'{day:%A}, {day:%B} {day.day}, {day.year}',
+        'hasPassed': False,
+        'artists': artists,
+        'venue': {
+            'name': f'{venue}, {rng.choice(HOODS)}',
+            'link': f'https://www.instagram.com/{venue.lower().replace(" ", "")}/',
+            'address': f'{rng.randint(1, 999)} {rng.choice(["Metropolitan", "Wythoff", "Avenue A", "Grand"])} Ave, New York, NY',
+            'description': _sentence(rng, 5, 15),
+        },
+        'time': f'{rng.randint(7, 10)}:{rng.choice(["00", "30"])} Doors',
+        'price': f'${rng.randint(10, 25)} adv, ${rng.randint(15, 30)} door',
+        'ticketLink': f'https://www.ticketweb.com/event/{rng.randint(10**7, 10**8)}',
+        'image': f'../img/{day:%Y-%m-%d}.png',
+    }
+    if rng.random() < 0.2:
+        event['videos'] = [{'url': f'https://example.com/video/{day:%Y%m%d}-{i}.mp4'} for i in range(rng.randint(1, 3))]
+    return event
+
+def make_corpus(count, out_dir, anchor=None, seed=1):
+    """Write a site with ``count`` events into out_dir and return its events dir."""
+    rng = random.Random(seed)
+    anchor = anchor or date.today()
+    out_dir = Path(out_dir)
+    events_dir = out_dir / 'events'
+    events_dir.mkdir(parents=True, exist_ok=True)
+    for template in ('template.html', 'template-archive.html'):
+        shutil.copy(REPO_DIR / 'events' / template, events_dir / template)
+    shutil.copy(REPO_DIR / 'index.html', out_dir / 'index.html')
+    last = anchor + timedelta(days=min(30, max(1, count // 10)))
+    for i in range(count):
+        day = last - timedelta(days=i)
+        with open(events_dir / f'{day:%Y-%m-%d}.json', 'w') as f:
+            json.dump(make_event(rng, day), f, indent=4)
+    return events_dir
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate a synthetic event corpus.')
+    parser.add_argument('count', type=int, help='number of events, e.g. 100, 1000 or 10000')
+    parser.add_argument('out_dir', help='directory to create the site in')
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+    events_dir = make_corpus(args.count, args.out_dir, seed=args.seed)
+    print(f'Wrote {args.count} events to {events_dir}')
+
+if __name__ == '__main__':
+    main()
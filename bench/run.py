@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""Time the generator and admin server hot paths on synthetic corpora.
+
+    python3 bench/run.py                       # 100, 1k and 10k events
+    python3 bench/run.py --sizes 1000 --output bench-1k.json
+    python3 bench/run.py --compare bench-old.json
+
+Each corpus size runs in its own process, so caches and imports start cold.
+Results are printed and optionally written as JSON; --compare prints the
+change against an earlier results file.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+BENCH_DIR = Path(__file__).resolve().parent
+REPO_DIR = BENCH_DIR.parent
+
+def _rounded(costs):
+    return {name: round(seconds, 6) for name, seconds in sorted(costs.items(), key=lambda item: -item[1])}
+
+def _timed(fn, repeat=1):
+    """Run fn repeat times; return (median seconds, last result)."""
+    times = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+# Run in a fresh interpreter by cold_start(); prints import and first-request seconds
+COLD_START = """
+import time
+started = time.perf_counter()
+import server
+imported = time.perf_counter()
+response = server.app.test_client().get('/events')
+print(imported - started, time.perf_counter() - imported, response.status_code)
+"""
+
+def _import_costs(stderr):
+    """Split -X importtime output into per-module cumulative seconds.
+
+    Returns ({module the admin server imports directly: seconds},
+    {module first imported while serving the first request: seconds}).
+    importtime lists a module after everything it imports, indented by depth.
+    """
+    startup, lazy = {}, {}
+    imported = False
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        _self, cumulative, name = line[len('import time:'):].split('|')
+        if not cumulative.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        name = name.strip()
+        seconds = int(cumulative) / 1e6
+        if depth == 0 and name == 'server':
+            imported = True
+        elif imported:
+            if depth == 0:
+                lazy[name] = seconds
+        elif depth == 0:
+            # Interpreter startup; only the server's own imports count
+            startup = {}
+        elif depth == 1:
+            startup[name] = seconds
+    return startup, lazy
+
+def cold_start(site_dir, repeat):
+    """Import the admin server and serve GET /events in fresh interpreters.
+
+    Returns (median import seconds, median first-request seconds, status,
+    startup module costs, first-request module costs) with module costs
+    from the last run.
+    """
+    env = dict(os.environ, ADMIN_SITE_DIR=str(site_dir), PUBLISH_DEBOUNCE='3600')
+    imports, requests = [], []
+    for _ in range(repeat):
+        proc = subprocess.run([sys.executable, '-X', 'importtime', '-c', COLD_START], cwd=REPO_DIR / 'admin',
+                              env=env, capture_output=True, text=True, check=True)
+        import_seconds, request_seconds, status = proc.stdout.split()[-3:]
+        imports.append(float(import_seconds))
+        requests.append(float(request_seconds))
+    startup, lazy = _import_costs(proc.stderr)
+    return statistics.median(imports), statistics.median(requests), int(status), startup, lazy
+
+def run_size(count, repeat):
+    """Run every scenario against a fresh corpus of ``count`` events."""
+    sys.path.insert(0, str(REPO_DIR))
+    sys.path.insert(0, str(BENCH_DIR))
+    import corpus
+    import generate_events
+
+    results = []
+
+    def record(scenario, seconds, **extra):
+        results.append(dict({'scenario': scenario, 'events': count, 'seconds': round(seconds, 6)}, **extra))
+
+    with tempfile.TemporaryDirectory(prefix=f'bench-{count}-') as tmp:
+        anchor = date.today()
+        events_dir = corpus.make_corpus(count, tmp, anchor=anchor)
+        quiet = contextlib.redirect_stdout(io.StringIO())
+
+        with quiet:
+            seconds, report = _timed(lambda: generate_events.build(events_dir, force=True, today=anchor))
+        record('full_rebuild', seconds, rebuilt=len(report.rebuilt), timings=report.to_dict()['timings'])
+
+        with quiet:
+            seconds, report = _timed(lambda: generate_events.build(events_dir, today=anchor), repeat)
+        record('noop_rebuild', seconds, rebuilt=len(report.rebuilt), skipped=len(report.skipped))
+
+        edited = generate_events.event_json_files(events_dir)[count // 2]
+        def edit_one():
+            data = json.loads(edited.read_text())
+            data['price'] = f"${time.perf_counter_ns() % 100} door"
+            edited.write_text(json.dumps(data, indent=4))
+            return generate_events.build(events_dir, changed=[edited.name], today=anchor)
+        with quiet:
+            seconds, report = _timed(edit_one, repeat)
+        record('single_edit', seconds, rebuilt=len(report.rebuilt), skipped=len(report.skipped))
+
+        with quiet:
+            seconds, report = _timed(lambda: generate_events.build(events_dir, today=anchor + timedelta(days=1)))
+        record('daily_rollover', seconds, rebuilt=len(report.rebuilt), skipped=len(report.skipped))
+
+        seconds, first_seconds, status, startup, lazy = cold_start(tmp, repeat)
+        record('server_import', seconds, modules=_rounded(startup))
+        record('first_request', first_seconds, status=status, modules=_rounded(lazy))
+
+        # The admin server reads its site directory at import time
+        os.environ['ADMIN_SITE_DIR'] = tmp
+        os.environ['PUBLISH_DEBOUNCE'] = '3600'
+        sys.path.insert(0, str(REPO_DIR / 'admin'))
+        with quiet:
+            import server
+        client = server.app.test_client()
+
+        seconds, response = _timed(lambda: client.get('/events'))
+        record('get_events_cold', seconds, status=response.status_code, bytes=len(response.data))
+        seconds, response = _timed(lambda: client.get('/events'), repeat)
+        record('get_events_warm', seconds, status=response.status_code, bytes=len(response.data))
+        etag = response.headers.get('ETag')
+        seconds, response = _timed(lambda: client.get('/events', headers={'If-None-Match': etag}), repeat)
+        record('get_events_304', seconds, status=response.status_code)
+
+        payload = {'filename': edited.name, 'data': json.loads(edited.read_text())}
+        def save_and_wait():
+            payload['data']['time'] = f"{time.perf_counter_ns() % 12}:00 Doors"
+            response = client.post('/save', json=payload)
+            server.build_scheduler.wait(response.get_json()['job'], timeout=600)
+            return response
+        with quiet:
+            seconds, response = _timed(save_and_wait, repeat)
+        record('post_save', seconds, status=response.status_code)
+
+    return results
+
+def _git_rev():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, previous):
+    old = {(r['scenario'], r['events']): r['seconds'] for r in previous['results']}
+    for r in results['results']:
+        before = old.get((r['scenario'], r['events']))
+        if before:
+            change = (r['seconds'] - before) / before * 100
+            print(f"{r['scenario']:>16} {r['events']:>6}  {before:9.4f}s -> {r['seconds']:9.4f}s  {change:+6.1f}%")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark event generation and the admin API.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5, help='runs per warm scenario (median is reported)')
+    parser.add_argument('--output', help='write results JSON to this file')
+    parser.add_argument('--compare', help='earlier results JSON to compare against')
+    parser.add_argument('--single', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--single-output', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        size_results = run_size(args.single, args.repeat)
+        with open(args.single_output, 'w') as f:
+            json.dump(size_results, f)
+        return
+
+    results = []
+    for count in args.sizes:
+        with tempfile.NamedTemporaryFile('r', suffix='.json') as out:
+            subprocess.run([sys.executable, __file__, '--single', str(count), '--repeat', str(args.repeat),
+                            '--single-output', out.name], stdout=subprocess.DEVNULL, check=True)
+            size_results = json.load(out)
+        results.extend(size_results)
+        for r in size_results:
+            print(f"{r['scenario']:>16} {r['events']:>6}  {r['seconds']:9.4f}s")
+
+    document = {
+        'rev': _git_rev(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(document, f, indent=2)
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compare(document, json.load(f))
+
+if __name__ == '__main__':
+    main()
@@ -1,219 +1,1816 @@
 #!/usr/bin/env python3
+import argparse
+import bisect
+import gzip
+import hashlib
 import json
 import os
+import posixpath
+import re
+import select
+import struct
+import tempfile
+import threading
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from datetime import datetime
+from datetime import date, datetime, timezone
+from html import escape
 
-def date_to_filename(date_str):
-    # Convert date string like "Friday May 9, 2025" or "Friday, May 9, 2025" to filename like "2025-05-09"
-    try:
-        # Try format with comma after day name
-        date_obj = datetime.strptime(date_str, "%A, %B %d, %Y")
-        return date_obj.strftime("%Y-%m-%d")
-    except ValueError:
+try:
+    import fcntl
+except ImportError:  # Windows: only the in-process lock applies
+    fcntl = None
+
+try:
+    import brotli
+except ImportError:  # Only .gz siblings are written without it
+    brotli = None
+
+BASE_DIR = Path(os.path.dirname(os.path.abspath(__file__)))
+EVENTS_DIR = BASE_DIR / 'events'
+
+# Parsed file contents kept between build() calls, keyed by path and
+# invalidated on (mtime, size). The admin server imports this module and
+# calls build() in-process, so these stay warm across saves.
+_file_cache = {}
+_build_lock = threading.Lock()
+
+# JSON files the generator writes into events/ itself; never treated as events
+UPCOMING_INDEX = 'upcoming.json'
+GENERATED_JSON = {UPCOMING_INDEX}
+
+# Records what each output was last built from, next to index.html. Bump
+# MANIFEST_VERSION whenever rendering changes so old entries are ignored.
+BUILD_MANIFEST = '.build-cache.json'
+MANIFEST_VERSION = 6
+
+# Static assets whose URLs get a ?v=<content hash> fingerprint in generated
+# pages and index.html, so they can be cached indefinitely. The hashes are
+# also written to ASSET_MANIFEST at the site root.
+ASSET_PATTERNS = ('style.css', 'css/**/*.css', 'js/**/*.js', 'admin/admin.css')
+ASSET_MANIFEST = 'assets.json'
+
+# Stylesheets and script for video.js, linked statically from the head of
+# passed events that have videos
+VIDEO_ASSETS = ('css/videojs/video-js.css', 'css/videojs-custom.css', 'js/videojs/video.min.js')
+
+# Text outputs and assets get .gz (and, with the brotli package, .br)
+# siblings so the admin server can send them precompressed
+COMPRESSIBLE_SUFFIXES = ('.html', '.json', '.css', '.js')
+
+# index.html lists upcoming events and only the most recent past ones; the
+# rest live in per-year archive pages (events/archive-<year>[-<page>].html)
+# rendered from ARCHIVE_TEMPLATE
+RECENT_PAST_EVENTS = 10
+ARCHIVE_PAGE_SIZE = 50
+ARCHIVE_TEMPLATE = 'template-archive.html'
+
+# Regions of index.html the generator owns, each delimited by a
+# <!-- region:NAME --> ... <!-- /region:NAME --> comment pair. Only the
+# content between the markers is rewritten; the rest is hand-edited.
+INDEX_REGIONS = ('upcoming', 'past')
+
+# Inverted index over artist/venue names and descriptions, written to
+# SEARCH_DIR at the site root: <prefix>.json shards keyed by each term's first
+# SEARCH_PREFIX characters, plus docs-<year>.json with the result summaries
+SEARCH_DIR = 'search'
+SEARCH_PREFIX = 2
+
+# Held (flock) for the duration of a build so a CLI run and every admin
+# server worker process never write the same pages at once
+BUILD_LOCKFILE = '.build.lock'
+
+# Flyer derivatives, written under the site root and named by the source
+# image's content hash. Widths never exceed the original.
+DERIVED_IMAGE_DIR = 'img/derived'
+IMAGE_WIDTHS = (480, 960, 1600)
+IMAGE_FORMATS = (('webp', 'WEBP'), ('jpg', 'JPEG'))
+IMAGE_SIZES = '(max-width: 768px) 100vw, 50vw'
+# Other flyers (e.g. SVG) are left as they are
+RASTER_SUFFIXES = ('.jpg', '.jpeg', '.png', '.gif', '.webp', '.bmp', '.tif', '.tiff')
+
+# Running totals for cache misses (actual disk reads); build() reports the
+# difference across a run
+_load_stats = {'files_read': 0, 'bytes_read': 0, 'read': 0.0, 'parse': 0.0}
+
+class BuildReport:
+    """Summary of a single build() run."""
+
+    def __init__(self):
+        self.events = 0
+        self.generated = []
+        self.rebuilt = []
+        self.skipped = []
+        self.invalid = []
+        self.messages = []
+        self.timings = {}
+        self.counters = {}
+
+    def log(self, message):
+        print(message)
+        self.messages.append(message)
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def add_timing(self, name, seconds):
+        self.timings[name] = self.timings.get(name, 0.0) + seconds
+
+    def wrote(self, path, nbytes):
+        """Record a file the build actually wrote."""
+        self.generated.append(path)
+        self.count('files_written')
+        self.count('bytes_written', nbytes)
+        self.log(f'Generated {path}')
+
+    def removed(self, path):
+        """Delete an output the build no longer produces.
+
+        It is listed with the outputs so the admin publisher stages the deletion.
+        """
+        path.unlink()
+        self.generated.append(path)
+        self.count('files_removed')
+        self.log(f'Removed {path}')
+
+    @contextmanager
+    def phase(self, name):
+        """Time a build phase; repeated phases accumulate."""
+        start = time.perf_counter()
         try:
-            # Try format without comma after day name
-            date_obj = datetime.strptime(date_str, "%A %B %d, %Y")
-            return date_obj.strftime("%Y-%m-%d")
-        except ValueError:
-            try:
-                # Try format without comma after day name and year
-                date_obj = datetime.strptime(date_str, "%A %B %d %Y")
-                return date_obj.strftime("%Y-%m-%d")
-            except ValueError:
-                print(f"Warning: Could not parse date '{date_str}'. Using original string as filename.")
-                # Clean up the string to make a valid filename
-                return date_str.lower().replace(",", "").replace(" ", "-")
-
-def generate_event_page(json_file, all_events_data):
-    # Read the template
-    with open('events/template.html', 'r') as f:
-        template = f.read()
-    
-    # Read the JSON data
-    with open(json_file, 'r') as f:
-        event_data = json.load(f)
-    
-    # Update hasPassed based on the event date
+            yield
+        finally:
+            self.add_timing(name, time.perf_counter() - start)
+
+    @property
+    def output(self):
+        return '\n'.join(self.messages)
+
+    def to_dict(self):
+        return {
+            'events': self.events,
+            'generated': [str(p) for p in self.generated],
+            'rebuilt': len(self.rebuilt),
+            'skipped': len(self.skipped),
+            'invalid': [str(p) for p in self.invalid],
+            'timings': {name: round(seconds, 6) for name, seconds in self.timings.items()},
+            'counters': dict(self.counters),
+            'output': self.output,
+        }
+
+def _cached_read(path, loader, force=False):
+    """Return loader(path), reusing the previous result while the file is unchanged."""
+    path = str(path)
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size)
+    entry = _file_cache.get(path)
+    if force or entry is None or entry[0] != key:
+        entry = (key, loader(path))
+        _file_cache[path] = entry
+    return entry[1]
+
+def _read_text(path):
+    with open(path, 'r') as f:
+        return f.read()
+
+def _read_json(path):
+    with open(path, 'r') as f:
+        return json.load(f)
+
+# New files are created with the same permissions open(..., 'w') would give
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def write_if_changed(path, content):
+    """Atomically replace path with content unless it already holds those bytes.
+
+    The new bytes go to a temporary file in the same directory which is then
+    renamed over the target, so readers never see a half-written file.
+    Returns True if the file was written.
+    """
+    if isinstance(content, str):
+        content = content.encode()
+    path = Path(path)
     try:
-        event_date = datetime.strptime(event_data['date'], "%A %B %d, %Y")
-        current_date = datetime.now()
-        # Compare dates without time component
-        event_date = event_date.replace(hour=0, minute=0, second=0, microsecond=0)
-        current_date = current_date.replace(hour=0, minute=0, second=0, microsecond=0)
-        
-        # Set hasPassed to true only if the event date is strictly before current date
-        event_data['hasPassed'] = event_date < current_date
-        
-        # Write the updated JSON back to the file
-        with open(json_file, 'w') as f:
-            json.dump(event_data, f, indent=4)
-            f.write('\n')  # Add newline at end of file
-    except ValueError:
-        print(f"Warning: Could not parse date for event: {event_data['date']}")
-    
-    # Find all future events (excluding current event)
-    current_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-    upcoming_events = []
-    for other_event in all_events_data:
+        st = os.stat(path)
+    except FileNotFoundError:
+        mode = 0o666 & ~_UMASK
+    else:
+        mode = st.st_mode & 0o777
+        if st.st_size == len(content):
+            with open(path, 'rb') as f:
+                if f.read() == content:
+                    return False
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.chmod(tmp, mode)
+        os.replace(tmp, path)
+    except BaseException:
         try:
-            other_date = datetime.strptime(other_event['date'], "%A %B %d, %Y")
-            other_date = other_date.replace(hour=0, minute=0, second=0, microsecond=0)
-            # Include event if it's in the future and not the current event
-            if other_date >= current_date and other_event['date'] != event_data['date']:
-                upcoming_events.append(other_event)
-        except ValueError:
-            continue
-    
-    # Sort upcoming events by date
-    upcoming_events.sort(key=lambda x: datetime.strptime(x['date'], "%A %B %d, %Y"))
-    
-    # Add upcoming events to the event data
-    event_data['upcoming_events'] = upcoming_events
-    
-    # Replace the placeholder with actual JSON data
-    html_content = template.replace('EVENT_DATA_PLACEHOLDER', json.dumps(event_data))
-    
-    # Generate the output filename using the event date
-    date_filename = date_to_filename(event_data['date'])
-    output_file = f'events/{date_filename}.html'
-    
-    # Write the generated HTML
-    with open(output_file, 'w') as f:
-        f.write(html_content)
-    
-    print(f'Generated {output_file}')
-    return event_data
+            os.unlink(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+    return True
+
+def _compressors():
+    yield '.gz', lambda content: gzip.compress(content, compresslevel=9, mtime=0)
+    if brotli is not None:
+        yield '.br', lambda content: brotli.compress(content, quality=11)
+
+def precompress(path, report=None):
+    """Refresh path's compressed siblings if they are missing or older than it.
+
+    Returns the number of siblings written.
+    """
+    path = Path(path)
+    mtime = os.stat(path).st_mtime_ns
+    content = None
+    written = 0
+    for ext, compress in _compressors():
+        sibling = path.with_name(path.name + ext)
+        try:
+            if os.stat(sibling).st_mtime_ns >= mtime:
+                continue
+        except FileNotFoundError:
+            pass
+        if content is None:
+            with open(path, 'rb') as f:
+                content = f.read()
+        data = compress(content)
+        if write_if_changed(sibling, data):
+            written += 1
+            if report is not None:
+                report.count('files_compressed')
+                report.count('bytes_compressed', len(data))
+        else:
+            # Source was touched without changing; don't recompress it next build
+            os.utime(sibling)
+    return written
+
+def remove_orphan_siblings(directory):
+    """Delete .gz/.br files in directory whose source file no longer exists."""
+    removed = []
+    for ext in ('.gz', '.br'):
+        for sibling in Path(directory).glob(f'*{ext}'):
+            if not sibling.with_name(sibling.name[:-len(ext)]).exists():
+                sibling.unlink()
+                removed.append(sibling)
+    return removed
+
+def _digest(content):
+    if isinstance(content, str):
+        content = content.encode()
+    return hashlib.sha256(content).hexdigest()
+
+def _asset_hash(path):
+    start = time.perf_counter()
+    with open(path, 'rb') as f:
+        content = f.read()
+    _load_stats['files_read'] += 1
+    _load_stats['bytes_read'] += len(content)
+    _load_stats['read'] += time.perf_counter() - start
+    return _digest(content)[:10]
+
+def asset_hashes(site_dir):
+    """Site-relative path -> short content hash for every fingerprinted asset."""
+    site_dir = Path(site_dir)
+    assets = {}
+    for pattern in ASSET_PATTERNS:
+        for path in sorted(site_dir.glob(pattern)):
+            if path.is_file():
+                assets[path.relative_to(site_dir).as_posix()] = _cached_read(path, _asset_hash)
+    return assets
+
+def write_asset_manifest(assets, site_dir, report=None):
+    """Write assets.json; untouched when no asset changed."""
+    output_file = Path(site_dir) / ASSET_MANIFEST
+    content = (json.dumps(assets, indent=1, sort_keys=True) + '\n').encode()
+    if write_if_changed(output_file, content) and report is not None:
+        report.wrote(output_file, len(content))
+    return output_file
+
+# A quoted .css/.js URL, with any fingerprint or cache-buster already on it
+ASSET_URL = re.compile(r"""(["'])([^"'\s?#<>]+\.(?:css|js))(?:\?v=[\w.-]*)?\1""")
+
+def fingerprint_urls(html, assets, doc_dir=''):
+    """Point quoted asset URLs in html at ``url?v=<hash>``.
+
+    URLs are resolved against ``doc_dir``, the document's site-relative
+    directory; anything that is not a known asset is left alone.
+    """
+    def replace(match):
+        quote, url = match.group(1), match.group(2)
+        if '://' in url or url.startswith('//'):
+            return match.group(0)
+        if url.startswith('/'):
+            path = url.lstrip('/')
+        else:
+            path = posixpath.normpath(posixpath.join(doc_dir, url))
+        if path not in assets:
+            return match.group(0)
+        return f'{quote}{url}?v={assets[path]}{quote}'
+    return ASSET_URL.sub(replace, html)
+
+# Minification is conservative: HTML whitespace runs become one space,
+# comments go, and inline scripts keep their line breaks (no reliance on
+# semicolons). <pre> and <textarea> bodies are left untouched.
+_HTML_COMMENT = re.compile(r'<!--(?!\[if).*?-->', re.S)
+_RAW_BLOCK = re.compile(r'(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2\s*>)', re.S | re.I)
+_SCRIPT_TYPE = re.compile(r'\btype\s*=\s*["\']?([^"\'\s>]+)', re.I)
+_SPACE = re.compile(r'\s+')
+_CSS_COMMENT = re.compile(r'/\*.*?\*/', re.S)
+_CSS_PUNCTUATION = re.compile(r'\s*([{};,>])\s*')
+
+def minify_css(css):
+    css = _SPACE.sub(' ', _CSS_COMMENT.sub('', css))
+    return _CSS_PUNCTUATION.sub(r'\1', css).replace(';}', '}').strip()
+
+def minify_js(js):
+    """Drop indentation, blank lines and whole-line // comments."""
+    lines = (line.strip() for line in js.splitlines())
+    return '\n'.join(line for line in lines if line and not line.startswith('//'))
+
+def _collapse_html(fragment):
+    return _SPACE.sub(' ', _HTML_COMMENT.sub('', fragment))
+
+def minify_html(html):
+    """Strip comments and collapse whitespace in markup, inline scripts and styles."""
+    parts = []
+    pos = 0
+    for match in _RAW_BLOCK.finditer(html):
+        open_tag, tag, body, close_tag = match.groups()
+        parts.append(_collapse_html(html[pos:match.start()]))
+        tag = tag.lower()
+        if tag == 'script':
+            script_type = _SCRIPT_TYPE.search(open_tag)
+            script_type = script_type.group(1).lower() if script_type else 'text/javascript'
+            if script_type in ('importmap', 'application/json', 'application/ld+json'):
+                try:
+                    body = json.dumps(json.loads(body), separators=(',', ':'))
+                except ValueError:
+                    pass
+            elif script_type in ('text/javascript', 'application/javascript', 'module'):
+                body = minify_js(body)
+        elif tag == 'style':
+            body = minify_css(body)
+        parts.append(_collapse_html(open_tag) + body + close_tag)
+        pos = match.end()
+    parts.append(_collapse_html(html[pos:]))
+    return ''.join(parts).strip() + '\n'
+
+# Minified templates keyed by the digest of their (fingerprinted) source
+_minified_templates = {}
+
+class Template:
+    """A page template split once at its FOO_PLACEHOLDER markers.
+
+    Rendering joins the precomputed literal segments with the supplied
+    values instead of scanning the whole template for every page.
+    """
+
+    PLACEHOLDER = re.compile(r'\b([A-Z][A-Z0-9_]*_PLACEHOLDER)\b')
+
+    def __init__(self, text, name=None):
+        self.name = name
+        self.text = text
+        self.digest = _digest(text)
+        # Set on templates returned by minified(): bytes its literal text lost
+        self.minified = False
+        self.saved = 0
+        parts = self.PLACEHOLDER.split(text)
+        self._segments = parts[0::2]
+        self._names = parts[1::2]
+
+    @classmethod
+    def from_file(cls, template_file):
+        start = time.perf_counter()
+        text = _read_text(template_file)
+        _load_stats['files_read'] += 1
+        _load_stats['bytes_read'] += len(text)
+        _load_stats['read'] += time.perf_counter() - start
+        return cls(text, Path(template_file).name)
+
+    def fingerprinted(self, assets, doc_dir):
+        """Return a copy with asset URLs pinned to their current hashes.
+
+        The digest covers the rewritten text, so pages only rebuild when an
+        asset this template actually references changes.
+        """
+        text = fingerprint_urls(self.text, assets, doc_dir)
+        return self if text == self.text else Template(text, self.name)
+
+    def minified_copy(self):
+        """Return the minified form, computed once per distinct source text."""
+        template = _minified_templates.get(self.digest)
+        if template is None:
+            template = Template(minify_html(self.text), self.name)
+            template.minified = True
+            template.saved = len(self.text.encode()) - len(template.text.encode())
+            _minified_templates[self.digest] = template
+        return template
+
+    @property
+    def placeholders(self):
+        return set(self._names)
+
+    def render(self, values):
+        """Fill placeholders from values; unknown placeholders are left as they are."""
+        out = [self._segments[0]]
+        for name, segment in zip(self._names, self._segments[1:]):
+            out.append(values.get(name, name))
+            out.append(segment)
+        return ''.join(out)
+
+def load_template(template_file, force=False):
+    """Return the compiled Template, recompiled only when the file's mtime/size changes."""
+    return _cached_read(template_file, Template.from_file, force)
+
+class TemplateSet:
+    """The page templates in an events directory, looked up once per build.
+
+    An event uses, in order of preference: the file named by its
+    ``"template"`` field (e.g. a per-venue layout), ``template-past.html`` or
+    ``template-upcoming.html`` for its date bucket, then ``template.html``.
+    """
+
+    DEFAULT = 'template.html'
+
+    def __init__(self, events_dir, assets=None, minify=False):
+        self.events_dir = Path(events_dir)
+        self.assets = assets or {}
+        self.minify = minify
+        self.templates = {}
+
+    def get(self, name):
+        name = Path(name).name
+        if name not in self.templates:
+            try:
+                template = load_template(self.events_dir / name)
+            except FileNotFoundError:
+                template = None
+            if template is not None and self.assets:
+                template = template.fingerprinted(self.assets, self.events_dir.name)
+            if template is not None and self.minify:
+                template = template.minified_copy()
+            self.templates[name] = template
+        return self.templates[name]
+
+    def for_event(self, event, today):
+        layout = 'template-past.html' if event.has_passed(today) else 'template-upcoming.html'
+        candidates = [layout, self.DEFAULT]
+        if event.data.get('template'):
+            candidates.insert(0, str(event.data['template']))
+        for name in candidates:
+            template = self.get(name)
+            if template is not None:
+                return template
+        raise FileNotFoundError(self.events_dir / self.DEFAULT)
+
+    def loaded(self):
+        """Name -> Template for every template found so far."""
+        return {name: t for name, t in self.templates.items() if t is not None}
+
+def invalidate(paths=None):
+    """Drop cached contents for the given paths, or everything if none are given."""
+    if paths is None:
+        _file_cache.clear()
+        return
+    for path in paths:
+        _file_cache.pop(str(path), None)
+
+DATE_FORMATS = ("%A, %B %d, %Y", "%A %B %d, %Y", "%A %B %d %Y")
 
 def parse_date(date_str):
     """Helper function to parse dates in various formats"""
-    try:
-        return datetime.strptime(date_str, "%A, %B %d, %Y")
-    except ValueError:
+    for fmt in DATE_FORMATS:
         try:
-            return datetime.strptime(date_str, "%A %B %d, %Y")
+            return datetime.strptime(date_str, fmt)
         except ValueError:
-            return datetime.strptime(date_str, "%A %B %d %Y")
+            continue
+    raise ValueError(f"time data {date_str!r} does not match any known event date format")
 
-def update_main_page(events_data):
-    # Read the main page template
-    with open('index.html', 'r') as f:
-        main_page = f.read()
-    
-    # Sort events by date
-    upcoming_events = []
-    past_events = []
-    current_date = datetime.now()
-    
-    for event in events_data:
+class Event:
+    """One event JSON file, with its date parsed exactly once at load time."""
+
+    __slots__ = ('path', 'data', 'digest', 'date', 'sort_key', 'slug')
+
+    def __init__(self, path, data, digest=None):
+        self.path = Path(path)
+        self.data = data
+        self.digest = digest
         try:
-            event_date = parse_date(event['date'])
-            # Compare dates without time component
-            event_date = event_date.replace(hour=0, minute=0, second=0, microsecond=0)
-            current_date = current_date.replace(hour=0, minute=0, second=0, microsecond=0)
-            
-            if event_date >= current_date:  # Include today's events
-                upcoming_events.append(event)
-            else:
-                past_events.append(event)
-        except ValueError as e:
-            print(f"Warning: Could not parse date for event: {event['date']} - {str(e)}")
-            # Skip events with invalid dates
+            self.date = parse_date(data.get('date', '')).date()
+        except (TypeError, ValueError):
+            self.date = None
+        self.sort_key = (self.date or date.min, self.path.name)
+        if self.date is not None:
+            self.slug = self.date.strftime("%Y-%m-%d")
+        else:
+            # Clean up the string to make a valid filename
+            self.slug = str(data.get('date', '')).lower().replace(",", "").replace(" ", "-")
+
+    @classmethod
+    def from_file(cls, json_file):
+        start = time.perf_counter()
+        with open(json_file, 'rb') as f:
+            raw = f.read()
+        loaded = time.perf_counter()
+        event = cls(json_file, json.loads(raw), _digest(raw))
+        _load_stats['files_read'] += 1
+        _load_stats['bytes_read'] += len(raw)
+        _load_stats['read'] += loaded - start
+        _load_stats['parse'] += time.perf_counter() - loaded
+        return event
+
+    @property
+    def filename(self):
+        return self.path.name
+
+    @property
+    def output_file(self):
+        return self.path.parent / f'{self.slug}.html'
+
+    def has_passed(self, today):
+        return self.date is not None and self.date < today
+
+    def bucket(self, today):
+        return 'passed' if self.has_passed(today) else 'upcoming'
+
+    def to_listing(self):
+        """Event data as returned by the admin API's GET /events."""
+        listing = dict(self.data)
+        listing['filename'] = self.filename
+        listing['sort_date'] = self.date.strftime('%Y-%m-%d') if self.date else '0000-00-00'
+        return listing
+
+def load_event(json_file, force=False):
+    """Return the Event for json_file, reusing the cached one while the file is unchanged."""
+    return _cached_read(json_file, Event.from_file, force)
+
+def event_json_files(events_dir):
+    """Return the event JSON files in events_dir, skipping generator output."""
+    return sorted(p for p in Path(events_dir).glob('*.json') if p.name not in GENERATED_JSON)
+
+def upcoming_from(events, today):
+    """Return events on or after today, sorted by date."""
+    return sorted((e for e in events if e.date is not None and e.date >= today),
+                  key=lambda e: e.sort_key)
+
+def upcoming_summary(event):
+    """The few fields the "More Upcoming Events" sidebar shows."""
+    artists = event.data.get('artists')
+    venue = event.data.get('venue')
+    return {
+        'date': event.data['date'],
+        'label': f"{event.date:%B} {event.date.day}",
+        'artists': [artist.get('name', '') for artist in artists if isinstance(artist, dict)]
+                   if isinstance(artists, list) else [],
+        'venue': venue.get('name', '') if isinstance(venue, dict) else '',
+        'href': event.output_file.name,
+    }
+
+def write_upcoming_index(upcoming, events_dir, report=None):
+    """Write events/upcoming.json, shared by every event page's sidebar.
+
+    The file is left untouched when its content is unchanged, so its ETag
+    stays stable and browsers revalidating it get a 304.
+    """
+    summaries = [upcoming_summary(event) for event in upcoming]
+    output_file = Path(events_dir) / UPCOMING_INDEX
+    content = json.dumps({'events': summaries}, separators=(',', ':')).encode()
+    if write_if_changed(output_file, content) and report is not None:
+        report.wrote(output_file, len(content))
+    return output_file
+
+# Pillow is imported on first use by the images phase rather than here: it
+# costs more than the rest of this module, which the admin server loads at
+# startup. False means not tried yet; None means not installed.
+_pil_image = False
+
+def pil_image():
+    """Return PIL.Image, or None when Pillow is not installed."""
+    global _pil_image
+    if _pil_image is False:
+        try:
+            from PIL import Image
+        except ImportError:  # Responsive image derivatives are skipped without Pillow
+            Image = None
+        _pil_image = Image
+    return _pil_image
+
+def local_image(event, site_dir):
+    """Return the site-relative path an event's ``image`` field points at, if it is local.
+
+    Resolved lexically (no filesystem access), with events living in a
+    directory directly under site_dir; the file may not exist.
+    """
+    src = event.data.get('image')
+    if not isinstance(src, str) or not src or src.startswith(('//', 'data:', '/')) or '://' in src:
+        return None
+    rel = posixpath.normpath(posixpath.join(event.path.parent.name, src))
+    if rel == '..' or rel.startswith('../'):
+        return None
+    return rel
+
+def _variant_widths(width):
+    """Derivative widths for an original; never upscales, always at least one."""
+    widths = [w for w in IMAGE_WIDTHS if w < width]
+    widths.append(min(width, IMAGE_WIDTHS[-1]))
+    return sorted(set(widths))
+
+def _variant_files(out_dir, digest, width):
+    return [Path(out_dir) / f'{digest}-{w}.{ext}' for w in _variant_widths(width) for ext, _fmt in IMAGE_FORMATS]
+
+def _encode_image(job):
+    """Write every derivative of one source image.
+
+    Returns (width, height, [(path, size) of each file written], error);
+    an image Pillow can't read gives (None, None, written, message).
+    """
+    source, digest, out_dir = job
+    PILImage = pil_image()
+    written = []
+    try:
+        with PILImage.open(source) as original:
+            original.load()
+            width, height = original.size
+            for w in _variant_widths(width):
+                h = max(1, round(height * w / width))
+                resized = original.resize((w, h), PILImage.LANCZOS) if w != width else original.copy()
+                for ext, fmt in IMAGE_FORMATS:
+                    out = resized
+                    if fmt == 'JPEG' and out.mode not in ('RGB', 'L'):
+                        # JPEG has no alpha: flatten onto white
+                        flat = PILImage.new('RGB', out.size, (255, 255, 255))
+                        rgba = out.convert('RGBA')
+                        flat.paste(rgba, mask=rgba.getchannel('A'))
+                        out = flat
+                    target = Path(out_dir) / f'{digest}-{w}.{ext}'
+                    tmp = target.with_name(f'.{target.name}.tmp')
+                    if fmt == 'JPEG':
+                        out.save(tmp, fmt, quality=82, optimize=True, progressive=True)
+                    else:
+                        out.save(tmp, fmt, quality=80, method=4)
+                    os.replace(tmp, target)
+                    written.append((target, target.stat().st_size))
+    except (OSError, PILImage.UnidentifiedImageError) as e:
+        return None, None, written, str(e)
+    return width, height, written, None
+
+def prepare_images(events, site_dir, manifest, report, jobs=1):
+    """Create resized WebP/JPEG derivatives of local event flyers.
+
+    Derivatives are named by the source's content hash, so an image is only
+    re-encoded when its bytes change; the manifest remembers each source's
+    hash and size so unchanged files are not even re-hashed. Returns a dict
+    of event filename -> image info for render_event_page.
+    """
+    if pil_image() is None:
+        if any(event.data.get('image') for event in events):
+            report.log('Pillow is not installed; skipping responsive image derivatives')
+        return {}
+    site_dir = Path(site_dir)
+    out_dir = site_dir / DERIVED_IMAGE_DIR
+    known = manifest.get('images') or {}
+    entries = {}
+    sources = {}
+    todo = {}
+    for event in events:
+        rel = local_image(event, site_dir)
+        if rel is None or not rel.lower().endswith(RASTER_SUFFIXES):
+            continue
+        if rel in entries:
+            sources[event.filename] = rel
+            continue
+        source = site_dir / rel
+        key = _file_key(source)
+        if key is None:
             continue
-    
-    # Sort events using the parse_date helper
-    upcoming_events.sort(key=lambda x: parse_date(x['date']))
-    past_events.sort(key=lambda x: parse_date(x['date']), reverse=True)
-    
-    # Generate upcoming events HTML
-    upcoming_html = '<h1>Upcoming Events</h1>\n<ul>\n'
-    for event in upcoming_events:
-        date_filename = date_to_filename(event['date'])
-        date_parts = event['date'].split(',')[0].split(' ')
-        if len(date_parts) >= 3:
-            date_short = date_parts[-2:]
-            date_display = f"{date_short[0]} {date_short[1]}"
+        entry = known.get(rel)
+        if entry is None or entry.get('file') != key:
+            if not source.is_file():
+                continue
+            with open(source, 'rb') as f:
+                entry = {'file': key, 'hash': _digest(f.read())[:16]}
+        sources[event.filename] = rel
+        entries[rel] = entry
+        if 'error' in entry:
+            continue
+        if 'width' not in entry or not all(p.exists() for p in _variant_files(out_dir, entry['hash'], entry['width'])):
+            todo[rel] = (source, entry['hash'], out_dir)
+
+    if todo:
+        out_dir.mkdir(parents=True, exist_ok=True)
+        names = list(todo)
+        if jobs > 1 and len(names) > 1:
+            with ProcessPoolExecutor(max_workers=jobs) as pool:
+                sizes = list(pool.map(_encode_image, [todo[name] for name in names]))
         else:
-            date_display = event['date']
-        artists = ', '.join(artist['name'] for artist in event['artists'])
-        venue = event['venue']['name']
-        upcoming_html += f'    <li><a href="events/{date_filename}.html"><button><i>{date_display}</i> {artists}<br>@ {venue}</button></a></li>\n'
-    upcoming_html += '    <li><i>More tba</i></li>\n</ul>'
-    
-    # Generate past events HTML
-    past_html = '<h1>Past Events</h1>\n<ul>\n'
-    for event in past_events:
-        date_filename = date_to_filename(event['date'])
-        date_parts = event['date'].split(',')[0].split(' ')
-        if len(date_parts) >= 3:
-            date_short = date_parts[-2:]
-            date_display = f"{date_short[0]} {date_short[1]}"
+            sizes = [_encode_image(todo[name]) for name in names]
+        for name, (width, height, written, error) in zip(names, sizes):
+            for path, nbytes in written:
+                report.wrote(path, nbytes)
+            if error is not None:
+                # Remembered against the file key, so it is retried only once the file changes
+                report.log(f"Could not read image {name}: {error}")
+                report.count('images_failed')
+                entries[name] = {'file': entries[name]['file'], 'hash': entries[name]['hash'], 'error': error}
+                continue
+            entries[name]['width'] = width
+            entries[name]['height'] = height
+            report.count('images_encoded')
+
+    # Drop derivatives of sources that changed or are no longer used
+    if out_dir.is_dir():
+        current = {entry['hash'] for entry in entries.values() if 'error' not in entry}
+        for stale in out_dir.iterdir():
+            if stale.name.split('-', 1)[0] not in current:
+                report.removed(stale)
+                report.count('images_pruned')
+    manifest['images'] = entries
+
+    # Event pages live in events/, so derivative URLs are relative to it
+    prefix = os.path.relpath(out_dir, site_dir / 'events').replace(os.sep, '/')
+    images = {}
+    for filename, rel in sources.items():
+        entry = entries[rel]
+        if 'error' in entry:
+            # Falls back to the plain <img>
+            continue
+        widths = _variant_widths(entry['width'])
+        base = f"{prefix}/{entry['hash']}"
+        images[filename] = {
+            'hash': entry['hash'],
+            'src': f'{base}-{widths[-1]}.jpg',
+            'srcset': ', '.join(f'{base}-{w}.jpg {w}w' for w in widths),
+            'webpSrcset': ', '.join(f'{base}-{w}.webp {w}w' for w in widths),
+            'sizes': IMAGE_SIZES,
+            'width': entry['width'],
+            'height': entry['height'],
+        }
+    return images
+
+# Event text fields are written as HTML, as the editor has always treated
+# them; only attribute values are escaped.
+
+def _shows_videos(event, today):
+    return bool(event.has_passed(today) and event.data.get('videos'))
+
+def _video_head(assets):
+    urls = [f'../{path}' for path in VIDEO_ASSETS]
+    head = ''.join(f'    <link rel="stylesheet" href="{url}">\n' for url in urls[:2])
+    head += (f'    <link rel="preload" href="{urls[2]}" as="script">\n'
+             f'    <script src="{urls[2]}" defer></script>')
+    return fingerprint_urls(head, assets or {}, 'events')
+
+def _artists_html(event):
+    items = []
+    for artist in event.data.get('artists', []):
+        name = artist.get('name', '')
+        if artist.get('link'):
+            name = f'<a href="{escape(artist["link"])}">{name}</a>'
+        description = f'<br>{artist["description"]}' if artist.get('description') else ''
+        items.append(f'                <li><button>{name}</button>{description}</li>\n                <br>')
+    return '\n'.join(items)
+
+def _details_html(event, today):
+    venue = event.data.get('venue', {})
+    passed = event.has_passed(today)
+    details = [f'<i>{event.data["date"].split(",")[0]}</i>']
+    if venue.get('link'):
+        details.append(f'<a href="{escape(venue["link"])}">@ {venue.get("name", "")}</a>')
+    else:
+        details.append(f'@ {venue.get("name", "")}')
+    if venue.get('address'):
+        details.append(venue['address'])
+    if venue.get('description'):
+        details.append(f'<p class="venue-description">{venue["description"]}</p>')
+    for field in ('time', 'price'):
+        if event.data.get(field):
+            details.append(f'<strike>{event.data[field]}</strike>' if passed else event.data[field])
+    if not passed and event.data.get('ticketLink'):
+        details.append(f'<a href="{escape(event.data["ticketLink"])}"><button>Tickets</button></a>')
+    return '\n'.join(f'                <li>{detail}</li>' for detail in details)
+
+def _media_html(event, today, image):
+    if _shows_videos(event, today):
+        videos = []
+        for index, video in enumerate(event.data['videos'], 1):
+            videos.append(
+                f'                <video id="my-video-{index}" class="video-js vjs-default-skin vjs-9-16" controls'
+                f' preload="auto" width="360" height="640" data-setup=\'{{"fluid": true, "aspectRatio": "9:16"}}\'>\n'
+                f'                    <source src="{escape(video.get("url", ""))}" type="video/mp4">\n'
+                f'                    <p class="vjs-no-js">To view this video please enable JavaScript, and consider'
+                f' upgrading to a web browser that supports HTML5 video</p>\n'
+                f'                </video>')
+        return '            <div class="video-container">\n' + '\n'.join(videos) + '\n            </div>'
+    if image is not None:
+        # Resized derivatives from prepare_images(); WebP where supported
+        return (f'            <picture>\n'
+                f'                <source type="image/webp" srcset="{image["webpSrcset"]}" sizes="{image["sizes"]}">\n'
+                f'                <img src="{image["src"]}" srcset="{image["srcset"]}" sizes="{image["sizes"]}"'
+                f' width="{image["width"]}" height="{image["height"]}" loading="lazy" decoding="async" alt="">\n'
+                f'            </picture>')
+    if event.data.get('image'):
+        return f'            <img src="{escape(event.data["image"])}" alt="">'
+    return ''
+
+def _minify_values(template, values, stats=None, compact=None):
+    """Return placeholder values to fill a minified template with.
+
+    Fragments are collapsed; ``compact`` supplies values already minified
+    some other way (e.g. compact JSON, which collapsing would corrupt).
+    The bytes saved, plus the template's own, are added to
+    ``stats['minify_saved']``. Values for other templates are returned as is.
+    """
+    if not template.minified:
+        return values
+    minified = {name: _collapse_html(value).strip() for name, value in values.items()}
+    minified.update(compact or {})
+    if stats is not None:
+        stats['minify_saved'] = stats.get('minify_saved', 0) + template.saved + sum(
+            len(values[name].encode()) - len(minified[name].encode()) for name in values)
+    return minified
+
+def render_event_page(event, template, today, image=None, assets=None, stats=None):
+    """Return the HTML for one event page.
+
+    The artists, details and media are rendered to static HTML here, so the
+    page needs no script to show its content. ``image`` is the event's entry
+    from prepare_images(), if it has one; ``assets`` are the fingerprints
+    used for the video.js links. With a minified template the fragments are
+    minified too, and the bytes saved are added to ``stats['minify_saved']``.
+    """
+    passed = event.has_passed(today)
+    values = {
+        'EVENT_HEAD_PLACEHOLDER': _video_head(assets) if _shows_videos(event, today) else '',
+        'EVENT_DATE_PLACEHOLDER': f'Archived Event <br>{event.data["date"]}' if passed else event.data['date'],
+        'EVENT_ARTISTS_PLACEHOLDER': _artists_html(event),
+        'EVENT_DETAILS_PLACEHOLDER': _details_html(event, today),
+        'EVENT_MEDIA_PLACEHOLDER': _media_html(event, today, image),
+        'EVENT_HREF_PLACEHOLDER': event.output_file.name,
+    }
+    # Custom layouts may still build the page from the raw event JSON
+    if 'EVENT_DATA_PLACEHOLDER' in template.placeholders:
+        event_data = dict(event.data)
+        # hasPassed is derived from the date at render time; the source JSON
+        # is never rewritten by the generator
+        event_data['hasPassed'] = passed
+        if image is not None:
+            event_data['imageSet'] = {key: value for key, value in image.items() if key != 'hash'}
+        values['EVENT_DATA_PLACEHOLDER'] = json.dumps(event_data)
+    compact = None
+    if template.minified and 'EVENT_DATA_PLACEHOLDER' in values:
+        compact = {'EVENT_DATA_PLACEHOLDER': json.dumps(event_data, separators=(',', ':'))}
+    return template.render(_minify_values(template, values, stats, compact))
+
+def generate_event_page(event, template, today, report=None, image=None, assets=None):
+    """Render one event page and write it if its content changed."""
+    output_file = event.output_file
+    if report is None:
+        if write_if_changed(output_file, render_event_page(event, template, today, image, assets)):
+            print(f'Generated {output_file}')
+            return True
+        return False
+    stats = {}
+    with report.phase('render'):
+        html_content = render_event_page(event, template, today, image, assets, stats).encode()
+    report.count('pages_rendered')
+    if stats:
+        report.count('minify_bytes_saved', stats['minify_saved'])
+    with report.phase('write'):
+        written = write_if_changed(output_file, html_content)
+    if written:
+        report.wrote(output_file, len(html_content))
+    return written
+
+# Per-process state for --jobs workers, set once by _init_render_worker
+_worker_state = {}
+
+def _init_render_worker(templates, today, assets):
+    _worker_state['templates'] = templates
+    _worker_state['today'] = today
+    _worker_state['assets'] = assets
+
+def _render_batch(jobs):
+    """Render and write a batch of (event, template name, image) jobs in a worker.
+
+    Returns the (path, size) of each file written, render/write seconds and
+    the bytes saved by minification.
+    """
+    templates = _worker_state['templates']
+    today = _worker_state['today']
+    assets = _worker_state['assets']
+    written = []
+    stats = {}
+    render_seconds = write_seconds = 0.0
+    for event, template_name, image in jobs:
+        start = time.perf_counter()
+        html_content = render_event_page(event, templates[template_name], today, image, assets, stats).encode()
+        rendered = time.perf_counter()
+        if write_if_changed(event.output_file, html_content):
+            written.append((event.output_file, len(html_content)))
+        render_seconds += rendered - start
+        write_seconds += time.perf_counter() - rendered
+    return written, render_seconds, write_seconds, stats.get('minify_saved', 0)
+
+def generate_event_pages(events, templates, today, report, jobs=1, images=None):
+    """Render pages serially, or across ``jobs`` processes in batches.
+
+    Both paths use render_event_page, so the output is byte-identical.
+    """
+    images = images or {}
+    if jobs <= 1 or len(events) < 2:
+        for event in events:
+            generate_event_page(event, templates.for_event(event, today), today, report,
+                                images.get(event.filename), templates.assets)
+        return
+    work = [(event, templates.for_event(event, today).name, images.get(event.filename)) for event in events]
+    batch_size = max(1, min(64, len(work) // (jobs * 4)))
+    batches = [work[i:i + batch_size] for i in range(0, len(work), batch_size)]
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_render_worker,
+                             initargs=(templates.loaded(), today, templates.assets)) as pool:
+        for written, render_seconds, write_seconds, saved in pool.map(_render_batch, batches):
+            # Worker time is summed across processes, so it can exceed wall-clock 'pages'
+            report.add_timing('render', render_seconds)
+            report.add_timing('write', write_seconds)
+            for output_file, nbytes in written:
+                report.wrote(output_file, nbytes)
+            if saved:
+                report.count('minify_bytes_saved', saved)
+        report.count('pages_rendered', len(work))
+
+def _event_list_item(event, prefix='events/'):
+    date_parts = event.data['date'].split(',')[0].split(' ')
+    if len(date_parts) >= 3:
+        date_short = date_parts[-2:]
+        date_display = f"{date_short[0]} {date_short[1]}"
+    else:
+        date_display = event.data['date']
+    artists = ', '.join(artist['name'] for artist in event.data['artists'])
+    venue = event.data['venue']['name']
+    return f'    <li><a href="{prefix}{event.slug}.html"><button><i>{date_display}</i> {artists}<br>@ {venue}</button></a></li>\n'
+
+# Rendered list items keyed by (event path, link prefix) and reused until the
+# event's digest changes; index.html and the archive pages share them
+_list_items = {}
+
+def event_list_item(event, prefix='events/'):
+    """Cached _event_list_item()."""
+    key = (event.path, prefix)
+    cached = _list_items.get(key)
+    if cached is not None and event.digest is not None and cached[0] == event.digest:
+        return cached[1]
+    item = _event_list_item(event, prefix)
+    _list_items[key] = (event.digest, item)
+    return item
+
+def past_events_by_year(events, today):
+    """Year -> that year's passed events, newest first."""
+    by_year = {}
+    for event in sorted((e for e in events if e.date is not None and e.has_passed(today)),
+                        key=lambda e: e.sort_key, reverse=True):
+        by_year.setdefault(event.date.year, []).append(event)
+    return by_year
+
+def recent_past(events, today):
+    """The passed events index.html still lists, newest first."""
+    past = [e for e in events if e.date is not None and e.has_passed(today)]
+    return sorted(past, key=lambda e: e.sort_key, reverse=True)[:RECENT_PAST_EVENTS]
+
+def archive_filename(year, page=1):
+    return f'archive-{year}.html' if page == 1 else f'archive-{year}-{page}.html'
+
+def render_archive_pages(year, events, years, template, stats=None):
+    """Return [(filename, html)] for one year's archive, ARCHIVE_PAGE_SIZE events per page.
+
+    As with render_event_page, minified templates get minified fragments and
+    the bytes saved are added to ``stats['minify_saved']``.
+    """
+    chunks = [events[i:i + ARCHIVE_PAGE_SIZE] for i in range(0, len(events), ARCHIVE_PAGE_SIZE)]
+    year_links = ''.join(
+        f'    <li><a href="{archive_filename(y)}"><button>{f"<i>{y}</i>" if y == year else y}</button></a></li>\n'
+        for y in years)
+    pages = []
+    for number, chunk in enumerate(chunks, 1):
+        title = str(year) if len(chunks) == 1 else f'{year} (page {number} of {len(chunks)})'
+        nav = year_links
+        if len(chunks) > 1:
+            nav += '    <li>' + ' '.join(
+                f'<i>{n}</i>' if n == number else f'<a href="{archive_filename(year, n)}">{n}</a>'
+                for n in range(1, len(chunks) + 1)) + '</li>\n'
+        values = {
+            'ARCHIVE_TITLE_PLACEHOLDER': title,
+            'ARCHIVE_LIST_PLACEHOLDER': ''.join(event_list_item(event, prefix='') for event in chunk).rstrip('\n'),
+            'ARCHIVE_NAV_PLACEHOLDER': nav.rstrip('\n'),
+        }
+        html_content = template.render(_minify_values(template, values, stats))
+        pages.append((archive_filename(year, number), html_content))
+    return pages
+
+def update_archives(events, events_dir, templates, today, manifest, report):
+    """Write the per-year archive pages whose events changed; returns the years.
+
+    Each year is keyed in the manifest on its events' hashes and the list of
+    years (every page links to every year), so editing or passing an event
+    only re-renders its own year.
+    """
+    template = templates.get(ARCHIVE_TEMPLATE)
+    if template is None:
+        report.log(f'No {ARCHIVE_TEMPLATE}; skipping archive pages')
+        return []
+    events_dir = Path(events_dir)
+    by_year = past_events_by_year(events, today)
+    years = sorted(by_year, reverse=True)
+    previous = manifest.get('archives') or {}
+    archives = {}
+    for year in years:
+        page_count = -(-len(by_year[year]) // ARCHIVE_PAGE_SIZE)
+        entry = {
+            'inputs': _digest(json.dumps([[e.filename, e.digest] for e in by_year[year]] + [years])),
+            'template': f'{template.name}:{template.digest}',
+            'pages': [archive_filename(year, n) for n in range(1, page_count + 1)],
+        }
+        if previous.get(str(year)) == entry and all((events_dir / name).exists() for name in entry['pages']):
+            report.skipped.extend(events_dir / name for name in entry['pages'])
         else:
-            date_display = event['date']
-        artists = ', '.join(artist['name'] for artist in event['artists'])
-        venue = event['venue']['name']
-        past_html += f'    <li><a href="events/{date_filename}.html"><button><i>{date_display}</i> {artists}<br>@ {venue}</button></a></li>\n'
-    past_html += '</ul>'
-    
-    # Replace the sections in the main page
-    # Find the upcoming events section
-    upcoming_start = main_page.find('<h1>Upcoming Events</h1>')
-    upcoming_end = main_page.find('</ul>', upcoming_start) + 5
-    
-    # Find the past events section
-    past_start = main_page.find('<h1>Past Events</h1>')
-    past_end = main_page.find('</ul>', past_start) + 5
-    
-    # Replace the sections
-    new_main_page = (
-        main_page[:upcoming_start] +
-        upcoming_html +
-        main_page[upcoming_end:past_start] +
-        past_html +
-        main_page[past_end:]
-    )
-    
+            stats = {}
+            for name, html_content in render_archive_pages(year, by_year[year], years, template, stats):
+                html_content = html_content.encode()
+                if write_if_changed(events_dir / name, html_content):
+                    report.wrote(events_dir / name, len(html_content))
+                report.rebuilt.append(events_dir / name)
+            if stats:
+                report.count('minify_bytes_saved', stats['minify_saved'])
+        archives[str(year)] = entry
+
+    # Years or trailing pages that no longer have events
+    keep = {name for entry in archives.values() for name in entry['pages']}
+    for entry in previous.values():
+        for name in entry.get('pages', []):
+            if name not in keep and (events_dir / name).exists():
+                report.removed(events_dir / name)
+    manifest['archives'] = archives
+    return years
+
+def index_regions(events, today, archive_years=()):
+    """Region name -> (events listed, extra lines after them) for index.html."""
+    archive_links = [f'    <li><a href="events/{archive_filename(year)}"><button><i>Archive</i> {year}</button></a></li>\n'
+                     for year in archive_years]
+    return {
+        'upcoming': (upcoming_from(events, today), ['    <li><i>More tba</i></li>\n']),
+        'past': (recent_past(events, today), archive_links),
+    }
+
+def region_key(listed, extra, minify=False):
+    """Digest of what a region shows, from its events' cached list items.
+
+    Edits to fields a list item doesn't show leave the key unchanged.
+    """
+    return _digest(json.dumps([event_list_item(event) for event in listed] + [extra, minify]))
+
+def render_region(listed, extra):
+    return '<ul>\n' + ''.join(event_list_item(event) for event in listed) + ''.join(extra) + '</ul>'
+
+def find_region(html, name):
+    """Return the (start, end) offsets of a region's content in html.
+
+    Raises ValueError unless both markers appear exactly once and in order,
+    so a damaged page is reported rather than spliced into.
+    """
+    opening, closing = f'<!-- region:{name} -->', f'<!-- /region:{name} -->'
+    if html.count(opening) != 1 or html.count(closing) != 1:
+        raise ValueError(f"expected one {opening} ... {closing} pair")
+    start = html.index(opening) + len(opening)
+    end = html.index(closing)
+    if end < start:
+        raise ValueError(f"{closing} comes before {opening}")
+    return start, end
+
+def update_main_page(events, index_file='index.html', today=None, report=None, assets=None, archive_years=(),
+                     minify=False, regions=INDEX_REGIONS):
+    """Re-render the named ``regions`` of index.html and write it if it changed.
+
+    Regions not named keep their current content. Raises ValueError, leaving
+    the file untouched, when any region's markers are missing or overlap.
+    """
+    with open(index_file, 'r') as f:
+        main_page = f.read()
+
+    if today is None:
+        today = date.today()
+
+    # Validate every region before touching any, then splice from the end so
+    # earlier offsets stay valid
+    spans = sorted((find_region(main_page, name), name) for name in INDEX_REGIONS)
+    for ((_start, end), name), ((next_start, _end), next_name) in zip(spans, spans[1:]):
+        if end > next_start:
+            raise ValueError(f"regions {name} and {next_name} overlap")
+
+    listed = index_regions(events, today, archive_years)
+    for (start, end), name in reversed(spans):
+        if name not in regions:
+            continue
+        html = render_region(*listed[name])
+        # Only the generated lists are compacted; the rest of index.html is
+        # hand-edited and kept as written
+        if minify:
+            compact = _collapse_html(html)
+            if report is not None:
+                report.count('minify_bytes_saved', len(html.encode()) - len(compact.encode()))
+            html = compact
+        main_page = main_page[:start] + '\n' + html + '\n' + main_page[end:]
+    if assets:
+        main_page = fingerprint_urls(main_page, assets)
+
     # Write the updated main page
-    with open('index.html', 'w') as f:
-        f.write(new_main_page)
-    
-    print('Updated main page with current events')
-
-def is_valid_2025_date(date_str):
-    """Return True if the date is valid and in 2025, else False."""
-    for fmt in ["%A, %B %d, %Y", "%A %B %d, %Y", "%A %B %d %Y"]:
+    main_page = main_page.encode()
+    if not write_if_changed(index_file, main_page):
+        return
+
+    message = f"Updated main page ({', '.join(name for name in INDEX_REGIONS if name in regions) or 'assets'})"
+    if report is not None:
+        report.wrote(Path(index_file), len(main_page))
+        report.log(message)
+    else:
+        print(message)
+
+class ChangeWatcher:
+    """Report files created, changed or removed under a set of directories.
+
+    Uses Linux inotify through ctypes so no extra package is needed. On other
+    platforms ``available`` is False and callers fall back to stat polling.
+    """
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_Q_OVERFLOW = 0x00004000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    def __init__(self, directories):
+        self.available = False
+        self._fd = None
+        self._dirs = {}
         try:
-            dt = datetime.strptime(date_str, fmt)
-            return dt.year == 2025
-        except Exception:
-            continue
-    return False
+            import ctypes
+            import ctypes.util
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        except (OSError, AttributeError):
+            return
+        if fd < 0:
+            return
+        for directory in directories:
+            wd = libc.inotify_add_watch(fd, os.fsencode(str(directory)), self.MASK)
+            if wd < 0:
+                os.close(fd)
+                return
+            self._dirs[wd] = Path(directory)
+        self._fd = fd
+        self.available = True
 
-def main():
-    # Get all JSON files in the events directory
-    json_files = list(Path('events').glob('*.json'))
-    
-    # First pass: collect all event data
-    all_events_data = []
-    for json_file in json_files:
-        with open(json_file, 'r') as f:
-            event_data = json.load(f)
-            if is_valid_2025_date(event_data.get('date', '')):
-                all_events_data.append(event_data)
+    def fileno(self):
+        return self._fd
+
+    def drain(self):
+        """Return the set of changed paths since the last call.
+
+        Returns None when the kernel queue overflowed and the caller has to
+        rescan everything.
+        """
+        changed = set()
+        while True:
+            try:
+                buf = os.read(self._fd, 65536)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(buf):
+                wd, mask, _cookie, length = struct.unpack_from('iIII', buf, offset)
+                offset += 16
+                name = buf[offset:offset + length].rstrip(b'\0')
+                offset += length
+                if mask & self.IN_Q_OVERFLOW:
+                    changed = None
+                elif changed is not None and name and wd in self._dirs:
+                    changed.add(self._dirs[wd] / os.fsdecode(name))
+            if changed is None:
+                # Keep draining so the next call starts from a clean queue
+                while True:
+                    try:
+                        os.read(self._fd, 65536)
+                    except BlockingIOError:
+                        return None
+
+    def close(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            self.available = False
+
+_TAG = re.compile(r'<[^>]+>')
+_WORD = re.compile(r'\w+')
+
+def search_tokens(text):
+    """Lower-cased, accent-folded words of two or more characters."""
+    text = unicodedata.normalize('NFKD', _TAG.sub(' ', str(text)).lower())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return {word for word in _WORD.findall(text) if len(word) >= 2}
+
+def event_search_tokens(event):
+    """Search terms for an event: artist and venue names and descriptions."""
+    tokens = set()
+    artists = event.data.get('artists')
+    for artist in artists if isinstance(artists, list) else []:
+        if isinstance(artist, dict):
+            tokens |= search_tokens(artist.get('name', ''))
+            tokens |= search_tokens(artist.get('description', ''))
+    venue = event.data.get('venue', {})
+    if isinstance(venue, dict):
+        tokens |= search_tokens(venue.get('name', ''))
+        tokens |= search_tokens(venue.get('description', ''))
+    return tokens
+
+def _shard_name(token):
+    prefix = token[:SEARCH_PREFIX]
+    return prefix if re.fullmatch(r'[a-z0-9]+', prefix) else '_'
+
+class SearchIndex:
+    """Token -> events postings that can be updated one event at a time.
+
+    update() and remove() only touch the postings of that event's own terms,
+    so saves and deletes never rebuild the index. Not thread-safe on its own;
+    EventIndex guards it with its lock.
+    """
+
+    def __init__(self):
+        self._postings = {}
+        self._vocabulary = []
+        self._docs = {}
+
+    def update(self, event):
+        """Add or replace an event; returns False if its content was already indexed."""
+        doc = self._docs.get(event.filename)
+        if doc is not None and doc['digest'] == event.digest:
+            return False
+        # Everything that can fail runs before the postings are touched
+        tokens = event_search_tokens(event)
+        summary = upcoming_summary(event) if event.date is not None else None
+        self.remove(event.filename)
+        for token in tokens:
+            postings = self._postings.get(token)
+            if postings is None:
+                postings = self._postings[token] = set()
+                bisect.insort(self._vocabulary, token)
+            postings.add(event.filename)
+        self._docs[event.filename] = {'digest': event.digest, 'tokens': tokens, 'summary': summary,
+                                      'sort_key': event.sort_key}
+        return True
+
+    def remove(self, filename):
+        doc = self._docs.pop(filename, None)
+        if doc is None:
+            return False
+        for token in doc['tokens']:
+            postings = self._postings[token]
+            postings.discard(filename)
+            if not postings:
+                del self._postings[token]
+                del self._vocabulary[bisect.bisect_left(self._vocabulary, token)]
+        return True
+
+    def sync(self, events):
+        """Make the index match events exactly; returns True if anything changed."""
+        current = {event.filename for event in events}
+        changed = False
+        for filename in [name for name in self._docs if name not in current]:
+            changed = self.remove(filename) or changed
+        for event in events:
+            changed = self.update(event) or changed
+        return changed
+
+    def _matching(self, prefix):
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        matched = set()
+        for token in self._vocabulary[start:]:
+            if not token.startswith(prefix):
+                break
+            matched |= self._postings[token]
+        return matched
+
+    def search(self, query, limit=None):
+        """Filenames of events matching every query word (as a prefix), newest first."""
+        words = search_tokens(query) or {w for w in _WORD.findall(str(query).lower())}
+        if not words:
+            return []
+        matched = None
+        for word in sorted(words, key=len, reverse=True):
+            found = self._matching(word)
+            matched = found if matched is None else matched & found
+            if not matched:
+                return []
+        results = sorted(matched, key=lambda name: self._docs[name]['sort_key'], reverse=True)
+        return results if limit is None else results[:limit]
+
+    def summary(self, filename):
+        return self._docs[filename]['summary']
+
+    def shards(self):
+        """Prefix -> {token: [event page names]} for the static index, plus year -> summaries."""
+        shards = {}
+        years = {}
+        for token in self._vocabulary:
+            names = sorted(self._docs[name]['summary']['href'][:-len('.html')]
+                           for name in self._postings[token] if self._docs[name]['summary'])
+            if names:
+                shards.setdefault(_shard_name(token), {})[token] = names
+        for name, doc in self._docs.items():
+            summary = doc['summary']
+            if summary:
+                year = doc['sort_key'][0].year
+                years.setdefault(year, {})[summary['href'][:-len('.html')]] = summary
+        return shards, years
+
+# Kept across build() calls in one process so edits re-index a single event
+_search_index = SearchIndex()
+
+def write_search_index(events, site_dir, manifest, report):
+    """Write the sharded search index; only shards whose postings changed hit the disk."""
+    search_dir = Path(site_dir) / SEARCH_DIR
+    inputs = _digest(json.dumps(sorted((e.filename, e.digest) for e in events)))
+    _search_index.sync(events)
+    if manifest.get('search') == inputs and search_dir.is_dir():
+        return
+    search_dir.mkdir(exist_ok=True)
+    shards, years = _search_index.shards()
+    outputs = {f'{prefix}.json': postings for prefix, postings in shards.items()}
+    outputs.update({f'docs-{year}.json': docs for year, docs in years.items()})
+    for name, payload in outputs.items():
+        content = json.dumps(payload, separators=(',', ':'), sort_keys=True).encode()
+        if write_if_changed(search_dir / name, content):
+            report.wrote(search_dir / name, len(content))
+    for stale in search_dir.glob('*.json'):
+        if stale.name not in outputs:
+            report.removed(stale)
+    manifest['search'] = inputs
+
+class EventIndex:
+    """Process-wide parsed and sorted view of the events directory.
+
+    Files are re-read only when their (mtime, size) changes, or when the
+    inotify watcher reports them. With a working watcher, refresh() does no
+    disk I/O at all while nothing has changed.
+    """
+
+    def __init__(self, events_dir=EVENTS_DIR, watch=True):
+        self.events_dir = Path(events_dir)
+        self.version = 0
+        self.etag = None
+        self.last_modified = None
+        self._entries = {}
+        self._events = []
+        self._keys = []
+        self._pending = set()
+        self._rescan = True
+        self._search = SearchIndex()
+        self._lock = threading.Lock()
+        # Started by the first refresh(): finding libc runs ldconfig, and the
+        # admin server creates its index at import time
+        self._watch = watch
+        self._watcher = None
+
+    def _start_watcher(self):
+        self._watch = False
+        if self.events_dir.exists():
+            watcher = ChangeWatcher([self.events_dir])
+            self._watcher = watcher if watcher.available else None
+
+    def invalidate(self, filename=None):
+        """Mark one file, or the whole directory, as needing a re-read."""
+        with self._lock:
+            if filename is None:
+                self._rescan = True
+            else:
+                self._pending.add(self.events_dir / Path(filename).name)
+
+    def _load(self, path, key):
+        try:
+            event = Event.from_file(path)
+        except (OSError, ValueError) as e:
+            print(f"Error reading {path}: {e}")
+            return None
+        return key, event, event.to_listing()
+
+    def _stat(self, path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def refresh(self):
+        """Bring the index up to date; returns True if anything changed."""
+        with self._lock:
+            if self._watch:
+                self._start_watcher()
+            if self._watcher is not None:
+                reported = self._watcher.drain()
+                if reported is None:
+                    self._rescan = True
+                else:
+                    self._pending.update(p for p in reported if p.suffix == '.json')
+            elif self.events_dir.exists():
+                # No watcher: fall back to comparing stat results every time
+                self._rescan = True
+
+            if self._rescan:
+                paths = set(event_json_files(self.events_dir)) | set(self._entries)
+            else:
+                paths = {p for p in self._pending if p.name not in GENERATED_JSON}
+
+            changed = False
+            for path in paths:
+                key = self._stat(path)
+                entry = self._entries.get(path)
+                if key is None:
+                    if entry is not None:
+                        del self._entries[path]
+                        self._search.remove(path.name)
+                        changed = True
+                    continue
+                if entry is not None and entry[0] == key:
+                    continue
+                loaded = self._load(path, key)
+                if loaded is not None:
+                    try:
+                        self._search.update(loaded[1])
+                    except Exception as e:
+                        print(f"Error indexing {path}: {e}")
+                        loaded = None
+                if loaded is None:
+                    # Left out like an unreadable file
+                    self._entries.pop(path, None)
+                    self._search.remove(path.name)
+                else:
+                    self._entries[path] = loaded
+                changed = True
+            # Cleared only once every path was handled, so nothing is dropped
+            self._rescan = False
+            self._pending = set()
+
+            if changed or self.etag is None:
+                entries = sorted(self._entries.values(), key=lambda entry: entry[1].sort_key)
+                self._events = [listing for _key, _event, listing in entries]
+                self._keys = [(listing['sort_date'], listing['filename']) for listing in self._events]
+                fingerprint = hashlib.sha1()
+                newest = 0
+                for path in sorted(self._entries):
+                    key = self._entries[path][0]
+                    fingerprint.update(f'{path.name}:{key[0]}:{key[1]};'.encode())
+                    newest = max(newest, key[0])
+                dir_key = self._stat(self.events_dir)
+                if dir_key is not None:
+                    newest = max(newest, dir_key[0])
+                self.etag = fingerprint.hexdigest()
+                self.last_modified = datetime.fromtimestamp(newest / 1e9, tz=timezone.utc)
+                self.version += 1
+            return changed
+
+    def snapshot(self):
+        """Refresh, then return (version, etag, last_modified, events) consistently."""
+        self.refresh()
+        with self._lock:
+            return self.version, self.etag, self.last_modified, self._events
+
+    def select(self, start=None, end=None, after=None, limit=None):
+        """Return (version, etag, events, next_cursor, total) for a date window.
+
+        ``start``/``end`` are inclusive YYYY-MM-DD bounds and ``after`` is a
+        cursor from a previous page. The window is found by bisecting the
+        sorted index, so the cost depends on the page size, not the archive.
+        """
+        self.refresh()
+        with self._lock:
+            keys = self._keys
+            lo = bisect.bisect_left(keys, (start, '')) if start else 0
+            hi = bisect.bisect_right(keys, (end, '\uffff')) if end else len(keys)
+            total = max(0, hi - lo)
+            if after:
+                sort_date, _, filename = after.partition('|')
+                lo = max(lo, bisect.bisect_right(keys, (sort_date, filename)))
+            stop = hi if limit is None else min(hi, lo + limit)
+            page = self._events[lo:stop] if lo < stop else []
+            next_cursor = '|'.join(keys[stop - 1]) if page and stop < hi else None
+            return self.version, self.etag, page, next_cursor, total
+
+    def search(self, query, limit=None):
+        """Return (etag, [summary with filename]) for events matching query."""
+        self.refresh()
+        with self._lock:
+            results = []
+            for filename in self._search.search(query, limit):
+                summary = dict(self._search.summary(filename) or {})
+                summary['filename'] = filename
+                results.append(summary)
+            return self.etag, results
+
+def load_manifest(manifest_file):
+    try:
+        manifest = _read_json(manifest_file)
+    except (OSError, ValueError):
+        manifest = None
+    if not isinstance(manifest, dict) or manifest.get('version') != MANIFEST_VERSION:
+        manifest = {'version': MANIFEST_VERSION, 'pages': {}, 'images': {}, 'archives': {}, 'index': None}
+    return manifest
+
+def save_manifest(manifest_file, manifest):
+    write_if_changed(manifest_file, json.dumps(manifest, indent=1, sort_keys=True) + '\n')
+
+def _file_key(path):
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+@contextmanager
+def build_lock(root_dir):
+    """Serialize builds within this process and across processes sharing root_dir."""
+    with _build_lock:
+        if fcntl is None:
+            yield
+            return
+        with open(Path(root_dir) / BUILD_LOCKFILE, 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def build(events_dir=EVENTS_DIR, changed=None, force=False, jobs=1, today=None, compress=True, minify=False):
+    """Regenerate event pages and the main page whose inputs changed.
+
+    ``changed`` lists JSON files (paths or bare filenames) known to have been
+    written or deleted since the last call; they are re-read even if their
+    mtime looks unchanged. Everything else comes from the warm cache.
+
+    A page is skipped when its JSON hash, its template's hash and its date
+    bucket (upcoming/passed) all match the build manifest, so the daily
+    rollover only re-renders events that crossed the boundary. ``force``
+    ignores the manifest and rebuilds everything. ``jobs`` > 1 renders pages
+    in a process pool. ``today`` overrides the date used to decide which
+    events have passed. ``compress`` keeps .gz/.br siblings of text outputs
+    and assets up to date. ``minify`` strips comments and whitespace from
+    pages and the generated parts of index.html.
+    """
+    events_dir = Path(events_dir)
+    index_file = events_dir.parent / 'index.html'
+    manifest_file = events_dir.parent / BUILD_MANIFEST
+    report = BuildReport()
+    started = time.perf_counter()
+    loads_before = dict(_load_stats)
+    with build_lock(events_dir.parent):
+        report.add_timing('lock_wait', time.perf_counter() - started)
+        with report.phase('load'):
+            if changed:
+                invalidate(events_dir / Path(name).name for name in changed)
+
+            json_files = event_json_files(events_dir)
+            present = {str(p) for p in json_files}
+            stale = [p for p in _file_cache if p.endswith('.json') and Path(p).parent == events_dir and p not in present]
+            invalidate(stale)
+
+            assets = asset_hashes(events_dir.parent)
+            templates = TemplateSet(events_dir, assets, minify)
+            today = today or date.today()
+            manifest = load_manifest(manifest_file)
+            previous = json.dumps(manifest, sort_keys=True)
+            if force:
+                manifest['pages'] = {}
+                manifest['images'] = {}
+                manifest['archives'] = {}
+                manifest['search'] = None
+
+            # Single load pass: every date is parsed once, here
+            events = []
+            for json_file in json_files:
+                event = load_event(json_file)
+                if event.date is not None:
+                    events.append(event)
+                else:
+                    report.invalid.append(json_file)
+                    report.log(f"Skipping {json_file}: invalid date '{event.data.get('date', '')}'")
+            report.events = len(events)
+
+        # The sidebar list is written once and fetched by every page
+        with report.phase('upcoming'):
+            write_asset_manifest(assets, events_dir.parent, report)
+            write_upcoming_index(upcoming_from(events, today), events_dir, report)
+
+        # Resize local flyers; unchanged sources are neither hashed nor re-encoded
+        with report.phase('images'):
+            images = prepare_images(events, events_dir.parent, manifest, report, jobs)
+
+        # Generate HTML only for events whose inputs or date bucket changed
+        with report.phase('pages'):
+            pages = {}
+            to_render = []
+            for event in events:
+                template = templates.for_event(event, today)
+                entry = {
+                    'input': event.digest,
+                    'bucket': event.bucket(today),
+                    'output': event.output_file.name,
+                    'template': f'{template.name}:{template.digest}',
+                    'image': images[event.filename]['hash'] if event.filename in images else None,
+                    'video': [assets.get(path) for path in VIDEO_ASSETS] if _shows_videos(event, today) else None,
+                }
+                if manifest['pages'].get(event.filename) == entry and event.output_file.exists():
+                    report.skipped.append(event.output_file)
+                    report.count('pages_skipped')
+                else:
+                    to_render.append(event)
+                    report.rebuilt.append(event.output_file)
+                pages[event.filename] = entry
+            generate_event_pages(to_render, templates, today, report, jobs, images)
+            manifest['pages'] = pages
+
+        # Past events beyond the main page's recent slice, one archive per year
+        with report.phase('archives'):
+            archive_years = update_archives(events, events_dir, templates, today, manifest, report)
+
+        # Sharded search index for the site; rewritten only when events change
+        with report.phase('search'):
+            write_search_index(events, events_dir.parent, manifest, report)
+
+        # Update the main page once every page has been written. Only regions
+        # whose events (membership or order) changed are re-emitted; a hand
+        # edit to index.html re-emits them all.
+        with report.phase('index'):
+            region_keys = {name: region_key(*listed, minify)
+                           for name, listed in index_regions(events, today, archive_years).items()}
+            index_entry = manifest.get('index') or {}
+            known = index_entry.get('regions') or {}
+            if force or index_entry.get('file') != _file_key(index_file):
+                known = {}
+            emit = [name for name in INDEX_REGIONS if known.get(name) != region_keys[name]]
+            if emit or index_entry.get('assets') != assets:
+                try:
+                    update_main_page(events, index_file, today, report, assets, archive_years, minify, emit)
+                except ValueError as e:
+                    report.log(f"Could not update {index_file}: {e}")
+                    report.invalid.append(index_file)
+                    manifest['index'] = None
+                else:
+                    report.rebuilt.append(index_file)
+                    report.count('index_regions_emitted', len(emit))
+                    manifest['index'] = {'regions': region_keys, 'assets': assets, 'file': _file_key(index_file)}
             else:
-                print(f"Skipping {json_file}: invalid or non-2025 date '{event_data.get('date', '')}'")
-    
-    # Second pass: generate HTML for each JSON file with full event data
-    for json_file in json_files:
-        with open(json_file, 'r') as f:
-            event_data = json.load(f)
-            if is_valid_2025_date(event_data.get('date', '')):
-                generate_event_page(json_file, all_events_data)
+                report.skipped.append(index_file)
+
+        # Only outputs newer than their compressed siblings are recompressed.
+        # Once every output has been checked, later builds only look at the
+        # files they wrote, the assets, and the few always-present outputs
+        # that can also be edited by hand (index.html) or outside a build.
+        if compress:
+            with report.phase('compress'):
+                site_dir = events_dir.parent
+                outputs = list(report.generated) + [site_dir / name for name in assets]
+                outputs += [index_file, events_dir / UPCOMING_INDEX, site_dir / ASSET_MANIFEST]
+                if force or not manifest.get('compressed'):
+                    outputs += [e.output_file for e in events]
+                    outputs += [events_dir / name for entry in manifest['archives'].values() for name in entry['pages']]
+                    outputs += sorted((site_dir / SEARCH_DIR).glob('*.json'))
+                for output in outputs:
+                    if output.suffix in COMPRESSIBLE_SUFFIXES and output.exists():
+                        precompress(output, report)
+                for directory in (events_dir, site_dir / SEARCH_DIR):
+                    for removed in remove_orphan_siblings(directory):
+                        report.log(f'Removed {removed}')
+        manifest['compressed'] = compress
+
+        if json.dumps(manifest, sort_keys=True) != previous:
+            save_manifest(manifest_file, manifest)
+        # Templates load lazily during the pages phase, so count reads at the end
+        for name in ('files_read', 'bytes_read'):
+            report.count(name, _load_stats[name] - loads_before[name])
+        for name in ('read', 'parse'):
+            report.add_timing(name, _load_stats[name] - loads_before[name])
+        report.add_timing('total', time.perf_counter() - started)
+        report.log(f'{len(report.rebuilt)} rebuilt, {len(report.skipped)} skipped')
+        if report.counters.get('minify_bytes_saved'):
+            report.log(f"Minification saved {report.counters['minify_bytes_saved']} bytes")
+        report.log('Timings: ' + ', '.join(f'{name} {seconds:.3f}s' for name, seconds in report.timings.items()))
+    return report
+
+def _watched_files(events_dir):
+    """Every input a build reads: event JSON, templates, index.html and assets."""
+    site_dir = events_dir.parent
+    files = event_json_files(events_dir) + sorted(events_dir.glob('template*.html')) + [site_dir / 'index.html']
+    for pattern in ASSET_PATTERNS:
+        files += [path for path in sorted(site_dir.glob(pattern)) if path.is_file()]
+    return files
+
+def _is_watched(path, events_dir):
+    if path.parent == events_dir:
+        if path.suffix == '.json':
+            return path.name not in GENERATED_JSON
+        return path.suffix == '.html' and path.name.startswith('template')
+    return path == events_dir.parent / 'index.html' or path.suffix in ('.css', '.js')
+
+def watch(events_dir=EVENTS_DIR, jobs=1, compress=True, minify=False, debounce=0.2, interval=0.5):
+    """Rebuild whenever an input changes, until interrupted.
+
+    Changes are picked up through inotify where available, otherwise by
+    polling file stats every ``interval`` seconds. A burst of changes is
+    collected until ``debounce`` seconds pass quietly, then one incremental
+    build re-reads just the changed JSON. Files the build writes itself
+    (index.html) are recognised by their recorded stat key and ignored.
+    """
+    events_dir = Path(events_dir)
+    site_dir = events_dir.parent
+    build(events_dir, jobs=jobs, compress=compress, minify=minify)
+    directories = {events_dir, site_dir} | {path.parent for path in _watched_files(events_dir)}
+    watcher = ChangeWatcher(sorted(directories))
+    if not watcher.available:
+        watcher = None
+    known = {path: _file_key(path) for path in _watched_files(events_dir)}
+    print(f"Watching {site_dir} ({'inotify' if watcher else 'polling'}); press Ctrl-C to stop")
+
+    def poll(timeout):
+        """Wait up to timeout for input changes; returns the changed paths."""
+        if watcher is not None:
+            ready, _, _ = select.select([watcher], [], [], timeout)
+            if not ready:
+                return set()
+            reported = watcher.drain()
+            if reported is None:
+                candidates = set(_watched_files(events_dir)) | set(known)
             else:
-                print(f"Skipping HTML generation for {json_file}: invalid or non-2025 date '{event_data.get('date', '')}'")
-    
-    # Update the main page with current events
-    update_main_page(all_events_data)
+                candidates = {path for path in reported if _is_watched(path, events_dir)}
+        else:
+            time.sleep(timeout)
+            candidates = set(_watched_files(events_dir)) | set(known)
+        changed = set()
+        for path in candidates:
+            key = _file_key(path)
+            if key != known.get(path):
+                changed.add(path)
+                if key is None:
+                    known.pop(path, None)
+                else:
+                    known[path] = key
+        return changed
+
+    try:
+        while True:
+            changed = poll(None if watcher is not None else interval)
+            if not changed:
+                continue
+            detected = time.perf_counter()
+            while True:
+                more = poll(debounce)
+                if not more:
+                    break
+                changed |= more
+            started = time.perf_counter()
+            report = build(events_dir, changed=[path.name for path in changed if path.suffix == '.json'],
+                           jobs=jobs, compress=compress, minify=minify)
+            index_file = site_dir / 'index.html'
+            known[index_file] = _file_key(index_file)
+            finished = time.perf_counter()
+            print(f'Rebuilt for {len(changed)} changed file(s) in {finished - started:.3f}s '
+                  f'({finished - detected:.3f}s after the first change): '
+                  f'{len(report.rebuilt)} rebuilt, {len(report.skipped)} skipped')
+    except KeyboardInterrupt:
+        print('Stopped watching')
+    finally:
+        if watcher is not None:
+            watcher.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate event pages and update index.html.')
+    parser.add_argument('--force', action='store_true', help='ignore the build manifest and rebuild everything')
+    parser.add_argument('--jobs', '-j', type=int, default=1, metavar='N', help='render pages in N worker processes')
+    parser.add_argument('--no-compress', action='store_true', help='do not write .gz/.br copies of outputs')
+    parser.add_argument('--watch', action='store_true', help='keep running and rebuild when inputs change')
+    parser.add_argument('--minify', action='store_true', help='strip comments and whitespace from generated HTML')
+    args = parser.parse_args()
+    if args.watch:
+        watch(jobs=args.jobs, compress=not args.no_compress, minify=args.minify)
+    else:
+        build(force=args.force, jobs=args.jobs, compress=not args.no_compress, minify=args.minify)
 
 if __name__ == '__main__':
-    main() 
\ No newline at end of file
+    main()
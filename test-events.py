@@ -24,6 +24,8 @@ def test_events_loading():
     print(f"Found {len(json_files)} JSON files")
     
     for event_file in json_files:
+        if event_file.name == 'upcoming.json':
+            continue  # written by generate_events.py, not an event
         try:
             with open(event_file, 'r') as f:
                 event_data = json.load(f)